@@ -1,9 +1,9 @@
 import numpy as np
 from typing import List, Dict, Any
 
-def get_sample_f1_tracks() -> List[Dict[str, Any]]:
+def _build_sample_f1_tracks() -> List[Dict[str, Any]]:
     """
-    Returns accurate track point data for all 2025 F1 circuits
+    Builds accurate track point data for all 2025 F1 circuits
     Track points are based on real circuit layouts and scaled for optimal canvas display
     Coordinate system: 400-800 range for both X and Y for consistent scaling and zoom compatibility
     All tracks normalized to fit properly on canvas with zoom functionality
@@ -775,4 +775,16 @@ def get_sample_f1_tracks() -> List[Dict[str, Any]]:
         "is_active": True
     })
 
-    return tracks 
\ No newline at end of file
+    return tracks
+
+
+# The sample table is fixed, so build it once at import time
+_SAMPLE_F1_TRACKS = _build_sample_f1_tracks()
+
+
+def get_sample_f1_tracks() -> List[Dict[str, Any]]:
+    """
+    Returns the track point data for all sample circuits (see _build_sample_f1_tracks)
+    The track dictionaries are shared between calls and must be treated as read-only
+    """
+    return list(_SAMPLE_F1_TRACKS)
@@ -4,18 +4,28 @@ from pydantic import BaseModel
 from typing import List, Optional
 import numpy as np
 from sqlalchemy.orm import Session
-from simulation.optimizer import optimize_racing_line, RacingLineModel, get_available_models
-from schemas.track import Track, Car, TrackInput, PredefinedTrack, TrackPreset, TrackListItem
+from simulation.optimizer import optimize_racing_line, RacingLineModel, get_available_models, warm_up
+from schemas.track import Track, Car, TrackPoint, TrackInput, PredefinedTrack, TrackPreset, TrackListItem
 from schemas.response import SimulationResponse
 from database import get_db, create_tables
 from data.track_data import get_sample_f1_tracks
-import json
+import logging
+
+try:
+    import orjson  # noqa: F401 - required by ORJSONResponse
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    # orjson is optional - responses then use the stdlib json encoder
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+log = logging.getLogger(__name__)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Racing Line Optimizer",
     description="API for optimizing racing lines on user-drawn tracks",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse
 )
 
 # Add CORS middleware
@@ -55,6 +65,12 @@ async def startup_event():
         db.close()
     except Exception as e:
         print(f"Database initialization error: {e}")
+    
+    # Compile the simulation kernels now rather than on the first request
+    try:
+        warm_up()
+    except Exception as e:
+        log.warning("Simulation warm-up failed: %s", e)
 
 class SimulationRequest(BaseModel):
     """Request model for simulation with optional model parameter"""
@@ -76,33 +92,34 @@ async def simulate_racing_line(request: SimulationRequest):
     """
     Calculate optimal racing line for given track and car parameters
     """
-    print("\n" + "="*80)
-    print("🏁 SIMULATION REQUEST RECEIVED")
-    print("="*80)
-    print(f"📊 Request Details:")
-    print(f"  • Track Points: {len(request.track_points)} points")
-    print(f"  • Track Width: {request.width}m")
-    print(f"  • Track Friction: {request.friction}")
-    print(f"  • Cars: {len(request.cars)} car(s)")
-    print(f"  • Model: {request.model}")
+    # Per-request trace goes to the debug log so normal runs stay quiet
+    log.debug("=" * 80)
+    log.debug("🏁 SIMULATION REQUEST RECEIVED")
+    log.debug("=" * 80)
+    log.debug("📊 Request Details:")
+    log.debug("  • Track Points: %s points", len(request.track_points))
+    log.debug("  • Track Width: %sm", request.width)
+    log.debug("  • Track Friction: %s", request.friction)
+    log.debug("  • Cars: %s car(s)", len(request.cars))
+    log.debug("  • Model: %s", request.model)
     
-    for i, car_data in enumerate(request.cars):
-        print(f"  • Car {i+1}: {car_data.get('team_name', 'Unknown')}")
-        print(f"    - Mass: {car_data.get('mass', 'N/A')}kg")
-        print(f"    - Drag Coeff: {car_data.get('drag_coefficient', 'N/A')}")
-        print(f"    - Lift Coeff: {car_data.get('lift_coefficient', 'N/A')}")
+    if log.isEnabledFor(logging.DEBUG):
+        for i, car_data in enumerate(request.cars):
+            log.debug("  • Car %s: %s", i + 1, car_data.get('team_name', 'Unknown'))
+            log.debug("    - Mass: %skg", car_data.get('mass', 'N/A'))
+            log.debug("    - Drag Coeff: %s", car_data.get('drag_coefficient', 'N/A'))
+            log.debug("    - Lift Coeff: %s", car_data.get('lift_coefficient', 'N/A'))
 
     try:
         # Convert request to Track object
-        print(f"\n🛤️  TRACK PROCESSING:")
-        from schemas.track import TrackPoint
+        log.debug("🛤️  TRACK PROCESSING:")
         track_points = [TrackPoint(x=p['x'], y=p['y']) for p in request.track_points]
-        print(f"  • Converting {len(track_points)} points to TrackPoint objects")
-        print(f"  • First point: ({track_points[0].x:.2f}, {track_points[0].y:.2f})")
-        print(f"  • Last point: ({track_points[-1].x:.2f}, {track_points[-1].y:.2f})")
+        log.debug("  • Converting %s points to TrackPoint objects", len(track_points))
+        log.debug("  • First point: (%.2f, %.2f)", track_points[0].x, track_points[0].y)
+        log.debug("  • Last point: (%.2f, %.2f)", track_points[-1].x, track_points[-1].y)
         
         cars = [Car(**car_data) for car_data in request.cars]
-        print(f"  • Converting {len(cars)} car objects")
+        log.debug("  • Converting %s car objects", len(cars))
         
         track = Track(
             track_points=track_points,
@@ -110,51 +127,45 @@ async def simulate_racing_line(request: SimulationRequest):
             friction=request.friction,
             cars=cars
         )
-        print(f"  • Track object created successfully")
+        log.debug("  • Track object created successfully")
         
         # Track object created successfully
         
         # Validate and set the model
-        print(f"\n🧠 MODEL VALIDATION:")
-        print(f"  • Requested model: '{request.model}'")
+        log.debug("🧠 MODEL VALIDATION:")
+        log.debug("  • Requested model: '%s'", request.model)
         try:
             # get the requested model
             model = RacingLineModel(request.model)
-            print(f"  • Model validated: {model}")
+            log.debug("  • Model validated: %s", model)
         except ValueError:
-            print(f"  • ⚠️  Unknown model '{request.model}', using physics_based fallback")
+            log.warning("Unknown model '%s', using physics_based fallback", request.model)
             model = RacingLineModel.PHYSICS_BASED
         
         # Run simulation with the specified model
-        print(f"\n🏎️  STARTING OPTIMIZATION:")
-        print(f"  • Calling optimize_racing_line() with {model}")
+        log.debug("🏎️  STARTING OPTIMIZATION:")
+        log.debug("  • Calling optimize_racing_line() with %s", model)
         optimal_lines = optimize_racing_line(track, model)
         
         # Log simulation completion
-        print(f"\n✅ SIMULATION COMPLETED:")
-        print(f"  • Generated {len(optimal_lines)} racing line(s)")
-        lap_times = [line.get('lap_time', 0) for line in optimal_lines]
-        if lap_times and any(t > 0 for t in lap_times):
-            valid_times = [t for t in lap_times if t > 0]
-            print(f"  • Lap times: {valid_times}")
-            print(f"  • Fastest lap: {min(valid_times):.2f}s")
-        else:
-            print(f"  • No valid lap times calculated")
-        
-        for i, line in enumerate(optimal_lines):
-            if 'racing_line' in line:
-                print(f"  • Car {i+1}: {len(line['racing_line'])} racing line points")
-        print("="*80)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("✅ SIMULATION COMPLETED:")
+            log.debug("  • Generated %s racing line(s)", len(optimal_lines))
+            valid_times = [t for t in (line.get('lap_time', 0) for line in optimal_lines) if t > 0]
+            if valid_times:
+                log.debug("  • Lap times: %s", valid_times)
+                log.debug("  • Fastest lap: %.2fs", min(valid_times))
+            else:
+                log.debug("  • No valid lap times calculated")
+            
+            for i, line in enumerate(optimal_lines):
+                if 'racing_line' in line:
+                    log.debug("  • Car %s: %s racing line points", i + 1, len(line['racing_line']))
+            log.debug("=" * 80)
         
         return {"optimal_lines": optimal_lines}
     except Exception as e:
-        print(f"\n❌ SIMULATION FAILED:")
-        print(f"  • Error: {str(e)}")
-        print(f"  • Type: {type(e).__name__}")
-        import traceback
-        print(f"  • Traceback:")
-        traceback.print_exc()
-        print("="*80)
+        log.exception("❌ SIMULATION FAILED: %s (%s)", e, type(e).__name__)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/models")
@@ -237,7 +248,6 @@ async def get_track_by_id(track_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Track not found")
         
         # Convert track_points from JSON to TrackPoint objects
-        from schemas.track import TrackPoint
         track_points = [TrackPoint(**point) for point in track.track_points]
         
         # returning track metadata with the track points
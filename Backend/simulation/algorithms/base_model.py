@@ -1,12 +1,62 @@
 """
 Base racing line model class
 """
+import logging
 import numpy as np
 from abc import ABC, abstractmethod
 from typing import Tuple
 from scipy.ndimage import gaussian_filter1d
 from scipy.interpolate import splprep, splev
 
+log = logging.getLogger(__name__)
+
+# Right-multiplying (N, 2) row vectors by this rotates each by +90°: (x, y) -> (-y, x)
+ROTATE_90 = np.array([[0.0, 1.0], [-1.0, 0.0]])
+ROTATE_90.flags.writeable = False
+
+
+def split_xy(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split (N, 2) points into contiguous x and y arrays"""
+    return (np.ascontiguousarray(points[:, 0], dtype=np.float64),
+            np.ascontiguousarray(points[:, 1], dtype=np.float64))
+
+
+def closed_mask(points: np.ndarray, atol: float = 1e-3):
+    """
+    np.allclose(first, last, atol=atol) for a line of shape (N, 2), or for each
+    line of a stack of shape (..., N, 2) at once
+    """
+    first = points[..., 0, :]
+    last = points[..., -1, :]
+    return np.all(np.abs(first - last) <= atol + 1e-5 * np.abs(last), axis=-1)
+
+
+def track_frame(track_points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unit direction and perpendicular vectors at each track point
+    
+    Args:
+        track_points: Array of (x, y) coordinates
+        
+    Returns:
+        Tuple of (direction_vectors, perpendicular_vectors)
+    """
+    # Calculate track direction vectors (repeating the final segment) in one buffer
+    direction_vectors = np.empty((len(track_points), 2))
+    np.subtract(track_points[1:], track_points[:-1], out=direction_vectors[:-1])
+    direction_vectors[-1] = direction_vectors[-2]
+    
+    # Normalize direction vectors with safety checks
+    norms = np.hypot(direction_vectors[:, 0], direction_vectors[:, 1])
+    norms = np.where(norms == 0, 1, norms)
+    direction_vectors = direction_vectors / norms[:, np.newaxis]
+    direction_vectors = np.where(np.isfinite(direction_vectors), direction_vectors, 0.0)
+    
+    # Calculate perpendicular vectors (normal to track)
+    perpendicular_vectors = direction_vectors @ ROTATE_90
+    
+    return direction_vectors, perpendicular_vectors
+
 
 class BaseRacingLineModel(ABC):
     """
@@ -64,13 +114,13 @@ class BaseRacingLineModel(ABC):
                 sigmas = [0.8, 1.2, 1.8]
                 spline_smoothing = 0.1
             
-            # Apply multiple passes of Gaussian smoothing
-            for sigma in sigmas:
-                racing_line[:, 0] = gaussian_filter1d(racing_line[:, 0], sigma=sigma)
-                racing_line[:, 1] = gaussian_filter1d(racing_line[:, 1], sigma=sigma)
+            # Successive Gaussian passes compose into one: σ = √(Σ σᵢ²),
+            # applied to both coordinates in a single call
+            sigma = float(np.sqrt(np.sum(np.square(sigmas))))
+            racing_line = gaussian_filter1d(racing_line, sigma=sigma, axis=0)
             
             # Additional B-spline smoothing for professional appearance
-            tck, u = splprep([racing_line[:, 0], racing_line[:, 1]], 
+            tck, u = splprep(list(split_xy(racing_line)), 
                            s=len(racing_line) * spline_smoothing, per=False)
             u_new = np.linspace(0, 1, len(racing_line))
             x_smooth, y_smooth = splev(u_new, tck)
@@ -78,13 +128,12 @@ class BaseRacingLineModel(ABC):
             
         except Exception as e:
             # Fallback to simple smoothing if B-spline fails
-            print(f"Advanced smoothing failed, using fallback: {e}")
+            log.warning("Advanced smoothing failed, using fallback: %s", e)
             try:
                 sigma = 2.0 if smoothing_level == "heavy" else 1.5
-                racing_line[:, 0] = gaussian_filter1d(racing_line[:, 0], sigma=sigma)
-                racing_line[:, 1] = gaussian_filter1d(racing_line[:, 1], sigma=sigma)
-            except:
-                pass
+                racing_line = gaussian_filter1d(racing_line, sigma=sigma, axis=0)
+            except (ValueError, TypeError, RuntimeError) as fallback_error:
+                log.warning("Fallback smoothing failed, returning unsmoothed line: %s", fallback_error)
         
         return racing_line
     
@@ -98,20 +147,7 @@ class BaseRacingLineModel(ABC):
         Returns:
             Tuple of (direction_vectors, perpendicular_vectors)
         """
-        # Calculate track direction vectors
-        direction_vectors = np.diff(track_points, axis=0)
-        direction_vectors = np.vstack([direction_vectors, direction_vectors[-1]])
-        
-        # Normalize direction vectors with safety checks
-        norms = np.linalg.norm(direction_vectors, axis=1)
-        norms = np.where(norms == 0, 1, norms)
-        direction_vectors = direction_vectors / norms[:, np.newaxis]
-        direction_vectors = np.where(np.isfinite(direction_vectors), direction_vectors, 0.0)
-        
-        # Calculate perpendicular vectors (normal to track)
-        perpendicular_vectors = np.array([-direction_vectors[:, 1], direction_vectors[:, 0]]).T
-        
-        return direction_vectors, perpendicular_vectors
+        return track_frame(track_points)
     
     def apply_boundary_constraints(self, racing_line: np.ndarray, track_points: np.ndarray, 
                                  max_offset: float) -> np.ndarray:
@@ -126,13 +162,15 @@ class BaseRacingLineModel(ABC):
         Returns:
             Constrained racing line
         """
-        for i in range(len(racing_line)):
-            distance_from_center = np.linalg.norm(racing_line[i] - track_points[i])
-            if distance_from_center > max_offset:
-                # Scale down to stay within boundaries
-                direction = racing_line[i] - track_points[i]
-                scale_factor = max_offset / distance_from_center
-                racing_line[i] = track_points[i] + direction * scale_factor
+        n_points = len(racing_line)
+        centre_points = track_points[:n_points]
+        direction = racing_line - centre_points
+        distance_from_center = np.hypot(direction[:, 0], direction[:, 1])
+        outside = distance_from_center > max_offset
+        
+        # Scale down to stay within boundaries
+        scale_factor = max_offset / distance_from_center[outside]
+        racing_line[outside] = centre_points[outside] + direction[outside] * scale_factor[:, np.newaxis]
         
         return racing_line
     
@@ -4,7 +4,70 @@ Simple geometric approach for clean, smooth racing lines
 """
 import numpy as np
 from scipy.ndimage import gaussian_filter1d
-from .base_model import BaseRacingLineModel
+from .base_model import BaseRacingLineModel, closed_mask
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba is optional - the corner setup then runs as a plain Python loop
+    NUMBA_AVAILABLE = False
+
+
+def _apply_corner_setup(track_points, perpendicular_vectors, smoothed_curvature,
+                        max_offset, curvature_threshold, racing_line):
+    """Offset racing line points for corners and corner entry, in place"""
+    n_points = track_points.shape[0]
+    
+    for i in range(n_points):
+        if i < 5 or i > n_points - 5:
+            continue
+            
+        # Conservative offset based on curvature
+        if abs(smoothed_curvature[i]) > curvature_threshold:
+            # In a corner - move toward the inside for a good racing line
+            corner_direction = -np.sign(smoothed_curvature[i])
+            
+            # Calculate offset magnitude based on corner severity (conservative)
+            corner_severity = min(abs(smoothed_curvature[i]) * 200, 1.0)
+            offset_magnitude = max_offset * corner_severity * 0.6
+            
+            # Look ahead to see if we should position for corner exit
+            look_ahead = min(i + 12, n_points - 1)
+            avg_curvature_ahead = np.mean(np.abs(smoothed_curvature[i:look_ahead]))
+            
+            if avg_curvature_ahead < curvature_threshold:
+                # Straight ahead - position for corner exit
+                offset_magnitude *= 0.7  # Slightly more conservative
+            
+            racing_line[i, 0] = track_points[i, 0] + perpendicular_vectors[i, 0] * offset_magnitude * corner_direction
+            racing_line[i, 1] = track_points[i, 1] + perpendicular_vectors[i, 1] * offset_magnitude * corner_direction
+        else:
+            # On straights - look for upcoming corners (conservative)
+            look_ahead_distance = min(12, n_points - i - 1)
+            upcoming_corner_idx = -1
+            
+            for j in range(i + 1, i + look_ahead_distance + 1):
+                if j < n_points and abs(smoothed_curvature[j]) > curvature_threshold:
+                    upcoming_corner_idx = j
+                    break
+            
+            if upcoming_corner_idx >= 0:
+                # Position for optimal corner entry (conservative)
+                upcoming_corner_direction = -np.sign(smoothed_curvature[upcoming_corner_idx])
+                setup_offset = max_offset * 0.5 * (-upcoming_corner_direction)
+                
+                distance_to_corner = upcoming_corner_idx - i
+                transition_factor = max(0.1, 1 - (distance_to_corner / look_ahead_distance))
+                
+                racing_line[i, 0] = track_points[i, 0] + perpendicular_vectors[i, 0] * setup_offset * transition_factor
+                racing_line[i, 1] = track_points[i, 1] + perpendicular_vectors[i, 1] * setup_offset * transition_factor
+    
+    return racing_line
+
+
+if NUMBA_AVAILABLE:
+    _apply_corner_setup = njit(cache=True, fastmath=True)(_apply_corner_setup)
 
 
 class BasicModel(BaseRacingLineModel):
@@ -35,7 +98,6 @@ class BasicModel(BaseRacingLineModel):
         - Easy to understand
         """
         racing_line = track_points.copy()
-        n_points = len(track_points)
         
         # Ensure curvature is finite
         curvature = np.where(np.isfinite(curvature), curvature, 0.0)
@@ -46,59 +108,15 @@ class BasicModel(BaseRacingLineModel):
         # Conservative track width usage
         max_offset = track_width * 0.3  # Use 30% of track width (60% total)
         
-        # Smooth curvature for better corner detection
-        try:
-            smoothed_curvature = gaussian_filter1d(curvature, sigma=5.0)
-            smoothed_curvature = np.where(np.isfinite(smoothed_curvature), smoothed_curvature, 0.0)
-        except:
-            smoothed_curvature = curvature
+        # Smooth curvature for better corner detection (curvature is finite here, so the
+        # filter cannot fail)
+        smoothed_curvature = gaussian_filter1d(curvature, sigma=5.0)
         
         # Conservative corner detection for cleaner lines
         curvature_threshold = 0.005
         
-        for i in range(n_points):
-            if i < 5 or i > n_points - 5:
-                continue
-                
-            # Conservative offset based on curvature
-            if abs(smoothed_curvature[i]) > curvature_threshold:
-                # In a corner - move toward the inside for a good racing line
-                corner_direction = -np.sign(smoothed_curvature[i])
-                
-                # Calculate offset magnitude based on corner severity (conservative)
-                corner_severity = min(abs(smoothed_curvature[i]) * 200, 1.0)
-                offset_magnitude = max_offset * corner_severity * 0.6
-                
-                # Look ahead to see if we should position for corner exit
-                look_ahead = min(i + 12, n_points - 1)
-                avg_curvature_ahead = np.mean(np.abs(smoothed_curvature[i:look_ahead]))
-                
-                if avg_curvature_ahead < curvature_threshold:
-                    # Straight ahead - position for corner exit
-                    offset_magnitude *= 0.7  # Slightly more conservative
-                
-                offset = perpendicular_vectors[i] * offset_magnitude * corner_direction
-                racing_line[i] = track_points[i] + offset
-            else:
-                # On straights - look for upcoming corners (conservative)
-                look_ahead_distance = min(12, n_points - i - 1)
-                upcoming_corner_idx = None
-                
-                for j in range(i + 1, i + look_ahead_distance + 1):
-                    if j < n_points and abs(smoothed_curvature[j]) > curvature_threshold:
-                        upcoming_corner_idx = j
-                        break
-                
-                if upcoming_corner_idx is not None:
-                    # Position for optimal corner entry (conservative)
-                    upcoming_corner_direction = -np.sign(smoothed_curvature[upcoming_corner_idx])
-                    setup_offset = max_offset * 0.5 * (-upcoming_corner_direction)
-                    
-                    distance_to_corner = upcoming_corner_idx - i
-                    transition_factor = max(0.1, 1 - (distance_to_corner / look_ahead_distance))
-                    
-                    offset = perpendicular_vectors[i] * setup_offset * transition_factor
-                    racing_line[i] = track_points[i] + offset
+        _apply_corner_setup(track_points, perpendicular_vectors, smoothed_curvature,
+                            max_offset, curvature_threshold, racing_line)
         
         # Apply boundary constraints
         racing_line = self.apply_boundary_constraints(racing_line, track_points, max_offset)
@@ -107,9 +125,9 @@ class BasicModel(BaseRacingLineModel):
         racing_line = self.smooth_racing_line(racing_line, smoothing_level="heavy")
         
         # Ensure the racing line is properly closed for closed tracks
-        if len(track_points) > 2 and np.allclose(track_points[0], track_points[-1], atol=1e-3):
+        if len(track_points) > 2 and closed_mask(track_points):
             # This is a closed track, ensure the racing line is also closed
-            if not np.allclose(racing_line[0], racing_line[-1], atol=1e-3):
+            if not closed_mask(racing_line):
                 racing_line[-1] = racing_line[0]  # Force the last point to match the first
         
         return racing_line 
\ No newline at end of file
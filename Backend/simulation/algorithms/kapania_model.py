@@ -7,9 +7,102 @@ This implements the iterative two-step approach:
 1. Forward-backward integration for speed profile generation
 2. Convex optimization for path curvature minimization
 """
+import math
+import logging
 import numpy as np
 from scipy.ndimage import gaussian_filter1d
-from .base_model import BaseRacingLineModel
+from .base_model import BaseRacingLineModel, ROTATE_90
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba is optional - the integration passes then run as plain Python loops
+    # and the path curvature uses the NumPy implementation
+    NUMBA_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+
+def _forward_pass(max_steady_speeds, curvature, distances, mass, max_engine_force,
+                  acceleration_factor, min_corner_speed):
+    """Pass 2: forward integration under the acceleration limit"""
+    n_points = max_steady_speeds.shape[0]
+    forward_speeds = max_steady_speeds.copy()
+    min_speed_squared = min_corner_speed ** 2
+    
+    for i in range(1, n_points):
+        if distances[i-1] > 0:
+            # Calculate available acceleration force with parameter sensitivity
+            lateral_force_demand = mass * (forward_speeds[i-1]**2) * abs(curvature[i-1])
+            
+            # Available force depends on engine power and current cornering demands
+            cornering_loss_factor = min(lateral_force_demand / (mass * 50.0), 0.3)  # Max 30% loss
+            available_accel_force = max_engine_force * (1.0 - cornering_loss_factor)
+            
+            # Apply acceleration factor for different car configurations
+            effective_force = available_accel_force * acceleration_factor
+            
+            # Forward integration with realistic acceleration
+            speed_squared = forward_speeds[i-1]**2 + (2 * effective_force * distances[i-1]) / mass
+            new_speed = np.sqrt(max(speed_squared, min_speed_squared))
+            
+            # Take minimum with steady-state limit
+            forward_speeds[i] = min(new_speed, max_steady_speeds[i])
+    
+    return forward_speeds
+
+
+def _backward_pass(forward_speeds, curvature, distances, mass, braking_force, min_corner_speed):
+    """Pass 3: backward integration under the braking limit"""
+    n_points = forward_speeds.shape[0]
+    final_speeds = forward_speeds.copy()
+    min_speed_squared = min_corner_speed ** 2
+    
+    for i in range(n_points - 2, -1, -1):
+        if distances[i] > 0:
+            # Cornering demand reduces braking effectiveness
+            lateral_force_demand = mass * (final_speeds[i+1]**2) * abs(curvature[i+1])
+            cornering_braking_loss = min(lateral_force_demand / (mass * 30.0), 0.4)  # Max 40% loss
+            
+            # Total available braking force
+            available_brake_force = braking_force * (1.0 - cornering_braking_loss)
+            
+            # Backward integration with enhanced braking model
+            speed_squared = final_speeds[i+1]**2 - (2 * available_brake_force * distances[i]) / mass
+            new_speed = np.sqrt(max(speed_squared, min_speed_squared))
+            
+            # Take minimum with forward integration result
+            final_speeds[i] = min(new_speed, forward_speeds[i])
+    
+    return final_speeds
+
+
+def _path_curvature_kernel(points, curvature):
+    """Three-point curvature |v1 × v2| / (|v1| |v2|) at interior points, in place"""
+    n_points = points.shape[0]
+    
+    for i in range(1, n_points - 1):
+        dx1 = points[i, 0] - points[i-1, 0]
+        dy1 = points[i, 1] - points[i-1, 1]
+        dx2 = points[i+1, 0] - points[i, 0]
+        dy2 = points[i+1, 1] - points[i, 1]
+        
+        len1 = math.hypot(dx1, dy1)
+        len2 = math.hypot(dx2, dy2)
+        
+        if len1 > 1e-6 and len2 > 1e-6:
+            curvature[i] = abs(dx1 * dy2 - dy1 * dx2) / (len1 * len2)
+        else:
+            curvature[i] = 0.0
+    
+    return curvature
+
+
+if NUMBA_AVAILABLE:
+    _forward_pass = njit(cache=True, fastmath=True)(_forward_pass)
+    _backward_pass = njit(cache=True, fastmath=True)(_backward_pass)
+    _path_curvature_kernel = njit(cache=True, fastmath=True)(_path_curvature_kernel)
 
 class KapaniaModel(BaseRacingLineModel):
     """
@@ -41,10 +134,10 @@ class KapaniaModel(BaseRacingLineModel):
         self.HARDCODED_TRACK_WIDTH = 20.0  # meters (as requested)
         self.HARDCODED_DISCRETIZATION_STEP = 0.1  # discretization step
         
-        print(f"{self.name} initialized with hardcoded parameters:")
-        print(f"   • Track Width: {self.HARDCODED_TRACK_WIDTH}m")
-        print(f"   • Discretization: {self.HARDCODED_DISCRETIZATION_STEP}")
-        print(f"   • Max Iterations: {self.MAX_ITERATIONS}")
+        log.debug("%s initialized with hardcoded parameters:", self.name)
+        log.debug("   • Track Width: %sm", self.HARDCODED_TRACK_WIDTH)
+        log.debug("   • Discretization: %s", self.HARDCODED_DISCRETIZATION_STEP)
+        log.debug("   • Max Iterations: %s", self.MAX_ITERATIONS)
     
     def calculate_racing_line(self, track_points: np.ndarray, curvature: np.ndarray, 
                              track_width: float, car_params: dict = None, friction: float = 1.0) -> np.ndarray:
@@ -61,73 +154,78 @@ class KapaniaModel(BaseRacingLineModel):
         Returns:
             Array of (x, y) coordinates defining the optimal racing line
         """
-        print(f"\nKAPANIA TWO STEP ALGORITHM STARTING:")
-        print(f"   • Track points: {len(track_points)}")
-        print(f"   • Using hardcoded track width: {self.HARDCODED_TRACK_WIDTH}m")
-        print(f"   • Friction coefficient: {friction}")
+        log.debug("KAPANIA TWO STEP ALGORITHM STARTING:")
+        log.debug("   • Track points: %s", len(track_points))
+        log.debug("   • Using hardcoded track width: %sm", self.HARDCODED_TRACK_WIDTH)
+        log.debug("   • Friction coefficient: %s", friction)
         
         # Validate inputs
         if len(track_points) < 3:
-            print("ERROR: Insufficient track points for Kapania algorithm")
+            log.warning("Insufficient track points for Kapania algorithm")
             return track_points
             
         # Extract and validate Kapania-specific car parameters
         kapania_params = self._extract_kapania_parameters(car_params)
-        print(f"   • Car parameters extracted: {len(kapania_params)} parameters")
+        log.debug("   • Car parameters extracted: %s parameters", len(kapania_params))
         
-        # Initialize with track centerline
+        # Initialize with track centerline. Each iteration builds a new path array and
+        # never modifies earlier ones, so the best path can be kept by reference
         current_path = track_points.copy()
-        best_path = current_path.copy()
+        best_path = current_path
         best_lap_time = float('inf')
         
-        print(f"\nStarting iterative optimization:")
+        log.debug("Starting iterative optimization:")
         
         # Iterative two-step process
         for iteration in range(self.MAX_ITERATIONS):
-            print(f"\n   Iteration {iteration + 1}/{self.MAX_ITERATIONS}:")
+            log.debug("   Iteration %s/%s:", iteration + 1, self.MAX_ITERATIONS)
+            
+            # Curvature of the current path, shared by both steps of this iteration
+            path_curvature = self._calculate_curvature_from_points(current_path)
             
             # Step 1: Calculate speed profile for current path
-            print(f"      Step 1: Calculating speed profile...")
+            log.debug("      Step 1: Calculating speed profile...")
             speed_profile, current_lap_time = self._forward_backward_integration(
-                current_path, kapania_params, friction
+                current_path, kapania_params, friction, curvature=path_curvature
             )
-            print(f"      Speed profile calculated (lap time: {current_lap_time:.2f}s)")
+            log.debug("      Speed profile calculated (lap time: %.2fs)", current_lap_time)
             
             # Check if this is the best lap time so far
             if current_lap_time < best_lap_time:
                 lap_time_improvement = best_lap_time - current_lap_time
                 best_lap_time = current_lap_time
-                best_path = current_path.copy()
-                print(f"      New best lap time! Improvement: {lap_time_improvement:.2f}s")
+                best_path = current_path
+                log.debug("      New best lap time! Improvement: %.2fs", lap_time_improvement)
             else:
                 lap_time_improvement = best_lap_time - current_lap_time
-                print(f"      Lap time: {current_lap_time:.2f}s (no improvement)")
+                log.debug("      Lap time: %.2fs (no improvement)", current_lap_time)
             
             # Check convergence
             if iteration > 0 and abs(lap_time_improvement) < self.CONVERGENCE_THRESHOLD:
-                print(f"      Converged after {iteration + 1} iterations!")
+                log.debug("      Converged after %s iterations!", iteration + 1)
                 break
             
             # Step 2: Optimize path given speed profile (only if not converged)
             if iteration < self.MAX_ITERATIONS - 1:  # Don't update path on last iteration
-                print(f"      Step 2: Optimizing path curvature...")
+                log.debug("      Step 2: Optimizing path curvature...")
                 new_path = self._convex_path_optimization(
-                    current_path, speed_profile, kapania_params, friction
+                    current_path, speed_profile, kapania_params, friction,
+                    current_curvature=path_curvature
                 )
-                print(f"      Path optimized")
+                log.debug("      Path optimized")
                 current_path = new_path
         
-        print(f"\nKAPANIA ALGORITHM COMPLETED:")
-        print(f"   • Final lap time: {best_lap_time:.2f}s")
-        print(f"   • Iterations used: {min(iteration + 1, self.MAX_ITERATIONS)}")
-        print(f"   • Track usage: {self.track_usage}")
+        log.debug("KAPANIA ALGORITHM COMPLETED:")
+        log.debug("   • Final lap time: %.2fs", best_lap_time)
+        log.debug("   • Iterations used: %s", min(iteration + 1, self.MAX_ITERATIONS))
+        log.debug("   • Track usage: %s", self.track_usage)
         
         return best_path
     
     def _extract_kapania_parameters(self, car_params: dict) -> dict:
         """Extract and validate Kapania-specific parameters from car_params"""
         if not car_params:
-            print("   WARNING: No car parameters provided, using defaults")
+            log.warning("No car parameters provided, using defaults")
             car_params = {}
         
         # Extract Kapania-specific parameters with defaults from Table 1 in paper
@@ -152,14 +250,14 @@ class KapaniaModel(BaseRacingLineModel):
             'lift_coefficient': car_params.get('lift_coefficient', 3.0),
         }
         
-        print(f"      • Mass: {kapania_params['mass']} kg")
-        print(f"      • Yaw inertia: {kapania_params['yaw_inertia']} kg·m²")
-        print(f"      • Front/Rear axle: {kapania_params['front_axle_distance']:.2f}m / {kapania_params['rear_axle_distance']:.2f}m")
+        log.debug("      • Mass: %s kg", kapania_params['mass'])
+        log.debug("      • Yaw inertia: %s kg·m²", kapania_params['yaw_inertia'])
+        log.debug("      • Front/Rear axle: %.2fm / %.2fm", kapania_params['front_axle_distance'], kapania_params['rear_axle_distance'])
         
         return kapania_params
     
     def _forward_backward_integration(self, path_points: np.ndarray, car_params: dict, 
-                                    friction: float) -> tuple[np.ndarray, float]:
+                                    friction: float, curvature: np.ndarray = None) -> tuple[np.ndarray, float]:
         """
         Step 1: Forward-Backward Integration for Speed Profile
         
@@ -167,15 +265,18 @@ class KapaniaModel(BaseRacingLineModel):
         1. Maximum steady-state speeds (zero longitudinal force) - Equation 4
         2. Forward integration (acceleration limits) - Equation 5  
         3. Backward integration (braking limits) - Equation 6
+        
+        The path curvature may be passed in when the caller already has it.
         """
-        print(f"        🔸 Forward-backward integration (3-pass algorithm)")
+        log.debug("        🔸 Forward-backward integration (3-pass algorithm)")
         
         n_points = len(path_points)
         if n_points < 2:
             return np.full(n_points, 10.0), 60.0
         
         # Calculate path curvature from points
-        curvature = self._calculate_curvature_from_points(path_points)
+        if curvature is None:
+            curvature = self._calculate_curvature_from_points(path_points)
         
         # Calculate segment distances for integration
         distances = self._calculate_segment_distances(path_points)
@@ -186,10 +287,9 @@ class KapaniaModel(BaseRacingLineModel):
         friction_coeff = friction  # Use the friction parameter passed to the method
         g = 9.81  # gravity
         
-        print(f"           Pass 1: Maximum steady-state speeds")
+        log.debug("           Pass 1: Maximum steady-state speeds")
         # Pass 1: Maximum steady-state speed (Equation 4 from paper)
         # Enhanced with F1 aerodynamic effects and parameter sensitivity
-        max_steady_speeds = np.zeros(n_points)
         
         # Extract cornering performance parameters
         front_cs = car_params.get('front_cornering_stiffness', 80000.0)
@@ -203,61 +303,46 @@ class KapaniaModel(BaseRacingLineModel):
         max_speed_limit = car_params.get('max_speed_limit', 90.0)  # m/s
         min_corner_speed = car_params.get('min_corner_speed', 15.0)  # m/s
         
-        for i in range(n_points):
-            if abs(curvature[i]) > 1e-6:  # Avoid division by zero
-                # Base cornering speed from physics
-                base_speed = np.sqrt((friction_coeff * g) / abs(curvature[i]))
-                
-                # Apply configurable F1 aerodynamic and suspension effects
-                suspension_factor = cornering_factor * 1.2 + 0.3  # 30% base + 120% from stiffness
-                
-                max_steady_speeds[i] = base_speed * downforce_factor * suspension_factor
-            else:
-                # Straight line speed - configurable based on user settings
-                power_factor = max_engine_force / 15000.0  # Normalize to typical F1 power
-                max_steady_speeds[i] = max_straight_speed * (0.8 + 0.2 * power_factor)
-            
-            # Apply realistic F1 speed limits with enhanced parameter sensitivity
-            mass_factor = 798.0 / mass  # Lighter cars can go faster
-            max_steady_speeds[i] *= (0.90 + 0.10 * mass_factor)  # Increased mass sensitivity
-            
-            # Apply configurable speed limits
-            max_steady_speeds[i] = min(max_steady_speeds[i], max_speed_limit)
-            max_steady_speeds[i] = max(max_steady_speeds[i], min_corner_speed)
+        abs_curvature = np.abs(curvature)
+        is_corner = abs_curvature > 1e-6  # Avoid division by zero
         
-        print(f"           Pass 2: Forward integration (acceleration)")
-        # Pass 2: Forward integration with enhanced parameter sensitivity
-        forward_speeds = max_steady_speeds.copy()
+        # Base cornering speed from physics
+        with np.errstate(divide='ignore'):
+            base_speed = np.sqrt((friction_coeff * g) / abs_curvature)
+        
+        # Apply configurable F1 aerodynamic and suspension effects
+        suspension_factor = cornering_factor * 1.2 + 0.3  # 30% base + 120% from stiffness
         
+        # Straight line speed - configurable based on user settings
+        power_factor = max_engine_force / 15000.0  # Normalize to typical F1 power
+        straight_speed = max_straight_speed * (0.8 + 0.2 * power_factor)
+        
+        max_steady_speeds = np.where(
+            is_corner, base_speed * downforce_factor * suspension_factor, straight_speed
+        )
+        
+        # Apply realistic F1 speed limits with enhanced parameter sensitivity
+        mass_factor = 798.0 / mass  # Lighter cars can go faster
+        max_steady_speeds *= (0.90 + 0.10 * mass_factor)  # Increased mass sensitivity
+        
+        # Apply configurable speed limits
+        max_steady_speeds = np.minimum(max_steady_speeds, max_speed_limit)
+        max_steady_speeds = np.maximum(max_steady_speeds, min_corner_speed)
+        
+        log.debug("           Pass 2: Forward integration (acceleration)")
+        # Pass 2: Forward integration with enhanced parameter sensitivity
         # Calculate power-to-weight ratio effect
         power_to_weight = max_engine_force / mass
         base_power_to_weight = 15000.0 / 798.0  # Reference F1 values
         acceleration_factor = power_to_weight / base_power_to_weight
         
-        for i in range(1, n_points):
-            if distances[i-1] > 0:
-                # Calculate available acceleration force with parameter sensitivity
-                lateral_force_demand = mass * (forward_speeds[i-1]**2) * abs(curvature[i-1])
-                
-                # Available force depends on engine power and current cornering demands
-                cornering_loss_factor = min(lateral_force_demand / (mass * 50.0), 0.3)  # Max 30% loss
-                available_accel_force = max_engine_force * (1.0 - cornering_loss_factor)
-                
-                # Apply acceleration factor for different car configurations
-                effective_force = available_accel_force * acceleration_factor
-                
-                # Forward integration with realistic acceleration
-                speed_squared = forward_speeds[i-1]**2 + (2 * effective_force * distances[i-1]) / mass
-                min_speed_squared = min_corner_speed ** 2
-                new_speed = np.sqrt(max(speed_squared, min_speed_squared))
-                
-                # Take minimum with steady-state limit
-                forward_speeds[i] = min(new_speed, max_steady_speeds[i])
-        
-        print(f"           Pass 3: Backward integration (braking)")
-        # Pass 3: Backward integration with enhanced braking model
-        final_speeds = forward_speeds.copy()
+        forward_speeds = _forward_pass(
+            max_steady_speeds, curvature, distances, float(mass), float(max_engine_force),
+            float(acceleration_factor), float(min_corner_speed)
+        )
         
+        log.debug("           Pass 3: Backward integration (braking)")
+        # Pass 3: Backward integration with enhanced braking model
         # Extract yaw inertia for braking stability calculation
         yaw_inertia = car_params.get('yaw_inertia', 1200.0)
         stability_factor = 1200.0 / yaw_inertia  # Lower inertia = better braking stability
@@ -265,33 +350,22 @@ class KapaniaModel(BaseRacingLineModel):
         # Extract configurable brake performance
         brake_force_multiplier = car_params.get('brake_force_multiplier', 3.0)
         
-        for i in range(n_points - 2, -1, -1):
-            if distances[i] > 0:
-                # Calculate available braking force with parameter sensitivity
-                # Base braking force - configurable multiplier
-                base_braking_force = max_engine_force * brake_force_multiplier
-                
-                # Mass effect on braking (heavier cars need more distance)
-                mass_braking_factor = 798.0 / mass  # Lighter cars brake better
-                
-                # Yaw inertia effect (lower inertia = more stable under braking)
-                stability_braking_factor = stability_factor * 0.3 + 0.7  # 70% base + 30% from stability
-                
-                # Cornering demand reduces braking effectiveness
-                lateral_force_demand = mass * (final_speeds[i+1]**2) * abs(curvature[i+1])
-                cornering_braking_loss = min(lateral_force_demand / (mass * 30.0), 0.4)  # Max 40% loss
-                
-                # Total available braking force
-                available_brake_force = (base_braking_force * mass_braking_factor * 
-                                       stability_braking_factor * (1.0 - cornering_braking_loss))
-                
-                # Backward integration with enhanced braking model
-                speed_squared = final_speeds[i+1]**2 - (2 * available_brake_force * distances[i]) / mass
-                min_speed_squared = min_corner_speed ** 2
-                new_speed = np.sqrt(max(speed_squared, min_speed_squared))
-                
-                # Take minimum with forward integration result
-                final_speeds[i] = min(new_speed, forward_speeds[i])
+        # Base braking force - configurable multiplier
+        base_braking_force = max_engine_force * brake_force_multiplier
+        
+        # Mass effect on braking (heavier cars need more distance)
+        mass_braking_factor = 798.0 / mass  # Lighter cars brake better
+        
+        # Yaw inertia effect (lower inertia = more stable under braking)
+        stability_braking_factor = stability_factor * 0.3 + 0.7  # 70% base + 30% from stability
+        
+        # Braking force before the cornering loss, the same at every point
+        braking_force = base_braking_force * mass_braking_factor * stability_braking_factor
+        
+        final_speeds = _backward_pass(
+            forward_speeds, curvature, distances, float(mass), float(braking_force),
+            float(min_corner_speed)
+        )
         
         # Apply smoothing to avoid unrealistic speed changes
         final_speeds = gaussian_filter1d(final_speeds, sigma=0.8)
@@ -302,8 +376,10 @@ class KapaniaModel(BaseRacingLineModel):
         # Calculate lap time
         lap_time = self._calculate_lap_time(final_speeds, distances)
         
-        print(f"           Speed profile: {final_speeds.min():.1f}-{final_speeds.max():.1f} m/s")
-        print(f"           Lap time: {lap_time:.2f}s")
+        if log.isEnabledFor(logging.DEBUG):
+            # Range statistics are only worth computing when they are logged
+            log.debug("           Speed profile: %.1f-%.1f m/s", final_speeds.min(), final_speeds.max())
+        log.debug("           Lap time: %.2fs", lap_time)
         
         return final_speeds, lap_time
     
@@ -312,24 +388,26 @@ class KapaniaModel(BaseRacingLineModel):
         n_points = len(points)
         curvature = np.zeros(n_points)
         
-        for i in range(1, n_points - 1):
-            # Get three consecutive points
-            p1, p2, p3 = points[i-1], points[i], points[i+1]
-            
-            # Calculate vectors
-            v1 = p2 - p1
-            v2 = p3 - p2
+        if NUMBA_AVAILABLE and n_points >= 3:
+            # Fused compiled loop over the point triples
+            _path_curvature_kernel(np.ascontiguousarray(points, dtype=np.float64), curvature)
+        elif n_points >= 3:
+            # Vectors between consecutive points: v1 = p2 - p1, v2 = p3 - p2
+            segments = np.diff(points, axis=0)
+            v1 = segments[:-1]
+            v2 = segments[1:]
             
             # Calculate cross product magnitude (2D)
-            cross_mag = abs(v1[0] * v2[1] - v1[1] * v2[0])
+            cross_mag = np.abs(v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0])
             
             # Calculate segment lengths
-            len1 = np.linalg.norm(v1)
-            len2 = np.linalg.norm(v2)
+            len1 = np.hypot(v1[:, 0], v1[:, 1])
+            len2 = np.hypot(v2[:, 0], v2[:, 1])
             
-            if len1 > 1e-6 and len2 > 1e-6:
-                # Curvature = |cross_product| / (|v1| * |v2|)
-                curvature[i] = cross_mag / (len1 * len2)
+            # Curvature = |cross_product| / (|v1| * |v2|), zero for degenerate segments
+            valid = (len1 > 1e-6) & (len2 > 1e-6)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                curvature[1:-1] = np.where(valid, cross_mag / (len1 * len2), 0.0)
             
         # Set boundary conditions
         curvature[0] = curvature[1] if n_points > 1 else 0
@@ -340,31 +418,35 @@ class KapaniaModel(BaseRacingLineModel):
     def _calculate_segment_distances(self, points: np.ndarray) -> np.ndarray:
         """Calculate distances between consecutive points"""
         distances = np.zeros(len(points))
-        for i in range(1, len(points)):
-            distances[i-1] = np.linalg.norm(points[i] - points[i-1])
+        segments = np.diff(points, axis=0)
+        distances[:-1] = np.hypot(segments[:, 0], segments[:, 1])
         return distances
     
     def _calculate_lap_time(self, speeds: np.ndarray, distances: np.ndarray) -> float:
         """Calculate total lap time from speed profile and distances with improved accuracy"""
-        lap_time = 0.0
-        
-        for i in range(len(distances) - 1):
-            if distances[i] > 0:
-                # Use average speed between consecutive points for more accurate time calculation
-                current_speed = max(speeds[i], 5.0)  # Ensure minimum speed
-                next_speed = max(speeds[i + 1] if i + 1 < len(speeds) else speeds[i], 5.0)
-                
-                # Average speed for this segment
-                avg_speed = (current_speed + next_speed) / 2.0
-                
-                # Time for this segment
-                segment_time = distances[i] / avg_speed
-                lap_time += segment_time
+        n_segments = len(distances) - 1
+        if n_segments <= 0:
+            return 0.0
+        
+        # Use average speed between consecutive points for more accurate time calculation
+        segment_indices = np.arange(n_segments)
+        next_indices = np.where(segment_indices + 1 < len(speeds), segment_indices + 1, segment_indices)
+        current_speed = np.maximum(speeds[segment_indices], 5.0)  # Ensure minimum speed
+        next_speed = np.maximum(speeds[next_indices], 5.0)
+        
+        # Average speed for each segment
+        avg_speed = (current_speed + next_speed) / 2.0
+        
+        # Time for each segment; zero-length segments contribute nothing
+        segment_distances = distances[:n_segments]
+        segment_times = np.where(segment_distances > 0, segment_distances / avg_speed, 0.0)
+        lap_time = float(segment_times.sum())
         
         return lap_time
     
     def _convex_path_optimization(self, current_path: np.ndarray, speed_profile: np.ndarray,
-                                car_params: dict, friction: float) -> np.ndarray:
+                                car_params: dict, friction: float,
+                                current_curvature: np.ndarray = None) -> np.ndarray:
         """
         Step 2: Convex Path Optimization
         
@@ -377,138 +459,137 @@ class KapaniaModel(BaseRacingLineModel):
         Since we don't have cvxpy available, we use a simplified geometric approach
         that approximates the convex optimization behavior.
         """
-        print(f"        🔸 Convex path optimization (geometric approximation)")
+        log.debug("        🔸 Convex path optimization (geometric approximation)")
         
         n_points = len(current_path)
         if n_points < 3:
             return current_path
         
         # Calculate current path curvature
-        current_curvature = self._calculate_curvature_from_points(current_path)
+        if current_curvature is None:
+            current_curvature = self._calculate_curvature_from_points(current_path)
         
         # Identify high-curvature sections that need optimization
         curvature_threshold = np.percentile(np.abs(current_curvature), 75)  # Top 25% curvature
         high_curvature_indices = np.where(np.abs(current_curvature) > curvature_threshold)[0]
         
-        print(f"           Optimizing {len(high_curvature_indices)} high-curvature points")
+        log.debug("           Optimizing %s high-curvature points", len(high_curvature_indices))
         
         # Create optimized path
         optimized_path = current_path.copy()
         
-        # For each high-curvature section, apply geometric smoothing
-        for idx in high_curvature_indices:
-            if 1 <= idx <= n_points - 2:  # Only optimize interior points
-                # Get neighboring points
-                prev_point = current_path[idx - 1]
-                curr_point = current_path[idx]
-                next_point = current_path[idx + 1]
-                
-                # Calculate the optimal point using racing line theory
-                optimized_point = self._calculate_optimal_point(
-                    prev_point, curr_point, next_point, speed_profile[idx], car_params
-                )
-                
-                # Apply track boundary constraints
-                bounded_point = self._apply_track_boundaries(
-                    curr_point, optimized_point, self.HARDCODED_TRACK_WIDTH
-                )
-                
-                optimized_path[idx] = bounded_point
+        # Only optimize interior points
+        interior_indices = high_curvature_indices[
+            (high_curvature_indices >= 1) & (high_curvature_indices <= n_points - 2)
+        ]
+        
+        if len(interior_indices) > 0:
+            # For each high-curvature section, apply geometric smoothing
+            optimized_points = self._calculate_optimal_point(
+                current_path[interior_indices - 1], current_path[interior_indices],
+                current_path[interior_indices + 1], speed_profile[interior_indices], car_params
+            )
+            
+            # Apply track boundary constraints to all candidates at once
+            optimized_path[interior_indices] = self._apply_track_boundaries(
+                current_path[interior_indices], optimized_points, self.HARDCODED_TRACK_WIDTH
+            )
         
         # Apply smoothing to ensure continuity
         optimized_path = self._smooth_path(optimized_path)
         
-        # Calculate curvature reduction
-        new_curvature = self._calculate_curvature_from_points(optimized_path)
-        curvature_reduction = np.mean(np.abs(current_curvature)) - np.mean(np.abs(new_curvature))
-        
-        print(f"           Curvature reduced by {curvature_reduction:.4f} (lower is better)")
+        # Calculate curvature reduction (diagnostic only)
+        if log.isEnabledFor(logging.DEBUG):
+            new_curvature = self._calculate_curvature_from_points(optimized_path)
+            curvature_reduction = np.mean(np.abs(current_curvature)) - np.mean(np.abs(new_curvature))
+            
+            log.debug("           Curvature reduced by %.4f (lower is better)", curvature_reduction)
         
         return optimized_path
     
     def _calculate_optimal_point(self, prev_point: np.ndarray, curr_point: np.ndarray, 
-                               next_point: np.ndarray, speed: float, car_params: dict) -> np.ndarray:
+                               next_point: np.ndarray, speed: np.ndarray, car_params: dict) -> np.ndarray:
         """
-        Calculate optimal point position using racing line theory
+        Calculate optimal point positions using racing line theory
         
         Implements a simplified version of the "wide-apex-wide" principle:
         - Widen the line to reduce curvature
         - Consider speed-dependent optimization
+        
+        Points are (N, 2) arrays of consecutive path points and speed is an (N,) array.
         """
         # Calculate the direction vectors
         v1 = curr_point - prev_point
         v2 = next_point - curr_point
         
-        # Normalize vectors
-        v1_len = np.linalg.norm(v1)
-        v2_len = np.linalg.norm(v2)
-        
-        if v1_len < 1e-6 or v2_len < 1e-6:
-            return curr_point
+        # Normalize vectors; degenerate segments keep their current point
+        v1_len = np.hypot(v1[:, 0], v1[:, 1])
+        v2_len = np.hypot(v2[:, 0], v2[:, 1])
+        degenerate = (v1_len < 1e-6) | (v2_len < 1e-6)
         
-        v1_norm = v1 / v1_len
-        v2_norm = v2 / v2_len
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v1_norm = v1 / v1_len[:, np.newaxis]
+            v2_norm = v2 / v2_len[:, np.newaxis]
         
         # Calculate the turn angle
-        dot_product = np.dot(v1_norm, v2_norm)
+        dot_product = v1_norm[:, 0] * v2_norm[:, 0] + v1_norm[:, 1] * v2_norm[:, 1]
         turn_angle = np.arccos(np.clip(dot_product, -1, 1))
         
         # Calculate optimal offset based on racing line theory
         # Higher speeds and sharper turns require more offset to reduce curvature
-        speed_factor = min(speed / 50.0, 2.0)  # Scale speed influence
+        speed_factor = np.minimum(speed / 50.0, 2.0)  # Scale speed influence
         turn_factor = turn_angle / np.pi  # Normalize turn angle
         
         # Calculate perpendicular direction (toward inside of turn)
-        perpendicular = np.array([-v1_norm[1], v1_norm[0]])
+        perpendicular = v1_norm @ ROTATE_90
         
         # Determine turn direction (left or right)
-        cross_product = v1_norm[0] * v2_norm[1] - v1_norm[1] * v2_norm[0]
-        if cross_product < 0:  # Right turn
-            perpendicular = -perpendicular
+        cross_product = v1_norm[:, 0] * v2_norm[:, 1] - v1_norm[:, 1] * v2_norm[:, 0]
+        right_turn = cross_product < 0
+        perpendicular[right_turn] = -perpendicular[right_turn]
         
         # Calculate optimal offset distance
         max_offset = self.HARDCODED_TRACK_WIDTH * 0.4  # Max 40% of track width
         offset_distance = max_offset * turn_factor * speed_factor
         
         # Apply offset to create wider line
-        optimized_point = curr_point + perpendicular * offset_distance
+        optimized_point = curr_point + perpendicular * offset_distance[:, np.newaxis]
         
-        return optimized_point
+        return np.where(degenerate[:, np.newaxis], curr_point, optimized_point)
     
     def _apply_track_boundaries(self, original_point: np.ndarray, 
                               optimized_point: np.ndarray, track_width: float) -> np.ndarray:
         """
-        Ensure optimized point stays within track boundaries
+        Ensure optimized points stay within track boundaries
         
-        This is a simplified constraint - in full implementation would use
-        the actual track boundary data from the curvilinear coordinate system
+        Accepts single points or (N, 2) arrays of points. This is a simplified
+        constraint - in full implementation would use the actual track boundary
+        data from the curvilinear coordinate system
         """
         # Calculate distance from original centerline
         offset = optimized_point - original_point
-        offset_distance = np.linalg.norm(offset)
+        offset_distance = np.hypot(offset[..., 0], offset[..., 1])
         
         # Maximum allowed offset (half track width)
         max_offset = track_width / 2.0
         
-        if offset_distance > max_offset:
-            # Scale down the offset to stay within boundaries
-            scale_factor = max_offset / offset_distance
-            bounded_offset = offset * scale_factor
-            return original_point + bounded_offset
+        # Scale down the offset to stay within boundaries
+        scale_factor = np.minimum(1.0, max_offset / np.maximum(offset_distance, 1e-12))
+        bounded_point = original_point + offset * scale_factor[..., np.newaxis]
         
-        return optimized_point
+        outside = (offset_distance > max_offset)[..., np.newaxis]
+        return np.where(outside, bounded_point, optimized_point)
     
     def _smooth_path(self, path: np.ndarray) -> np.ndarray:
         """
         Apply smoothing to ensure path continuity
         
-        Uses a simple moving average filter to maintain smooth transitions
+        Uses a simple moving average filter to maintain smooth transitions.
+        The path is smoothed in place, so callers pass their own working array.
         """
-        smoothed_path = path.copy()
-        
-        # Apply smoothing only to interior points
-        for i in range(1, len(path) - 1):
-            # Simple 3-point moving average
-            smoothed_path[i] = (path[i-1] + path[i] + path[i+1]) / 3.0
+        # Apply smoothing only to interior points: simple 3-point moving average
+        # (the right-hand side is evaluated in full before the interior is overwritten)
+        if len(path) > 2:
+            path[1:-1] = (path[:-2] + path[1:-1] + path[2:]) / 3.0
         
-        return smoothed_path
\ No newline at end of file
+        return path
\ No newline at end of file
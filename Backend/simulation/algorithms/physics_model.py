@@ -11,12 +11,15 @@ Mathematical Foundation:
 - Convergence: |T_new - T_old| < threshold
 """
 
+import logging
 import numpy as np
 from scipy.ndimage import gaussian_filter1d
-from .base_model import BaseRacingLineModel
+from .base_model import BaseRacingLineModel, ROTATE_90
 from ..aerodynamics import aerodynamic_model
 from ..curvilinear_coordinates import create_curvilinear_system
 
+log = logging.getLogger(__name__)
+
 
 class PhysicsBasedModel(BaseRacingLineModel):
     """
@@ -57,7 +60,7 @@ class PhysicsBasedModel(BaseRacingLineModel):
         4. Repeat until convergence
         """
         
-        print(f"\nPHYSICS OPTIMIZATION: Starting lap time minimization...")
+        log.debug("PHYSICS OPTIMIZATION: Starting lap time minimization...")
         
         # Input validation
         if track_points is None or len(track_points) < 3:
@@ -79,32 +82,32 @@ class PhysicsBasedModel(BaseRacingLineModel):
         try:
             # Optimization loop
             for iteration in range(self.MAX_ITERATIONS):
-                print(f"\n   Iteration {iteration + 1}/{self.MAX_ITERATIONS}:")
+                log.debug("   Iteration %s/%s:", iteration + 1, self.MAX_ITERATIONS)
                 
                 # Calculate racing line for current path
-                print(f"      Calculating physics-based racing line...")
+                log.debug("      Calculating physics-based racing line...")
                 racing_line = self._calculate_single_pass_racing_line(
                     current_path, curvature, track_width, params, friction
                 )
                 
                 # Calculate speed profile
-                print(f"      Calculating speed profile...")
+                log.debug("      Calculating speed profile...")
                 speeds = self._calculate_optimized_speed_profile(racing_line, params, friction)
                 
                 # Validate arrays match
                 if len(speeds) != len(racing_line):
-                    print(f"      Array length mismatch, adjusting...")
+                    log.warning("Array length mismatch, adjusting...")
                     min_len = min(len(speeds), len(racing_line))
                     speeds = speeds[:min_len]
                     racing_line = racing_line[:min_len]
                 
                 # Calculate lap time (optimization objective)
                 lap_time = self._calculate_lap_time(speeds, racing_line)
-                print(f"      Lap time: {lap_time:.2f}s")
+                log.debug("      Lap time: %.2fs", lap_time)
                 
                 # Check for reasonable lap time bounds
                 if lap_time <= 0 or lap_time > 1000:
-                    print(f"      Invalid lap time: {lap_time}s, skipping iteration")
+                    log.warning("Invalid lap time: %ss, skipping iteration", lap_time)
                     continue
                 
                 # Check for improvement
@@ -112,30 +115,30 @@ class PhysicsBasedModel(BaseRacingLineModel):
                     improvement = best_lap_time - lap_time
                     best_lap_time = lap_time
                     best_path = racing_line.copy()
-                    print(f"      New best! Improvement: {improvement:.2f}s")
+                    log.debug("      New best! Improvement: %.2fs", improvement)
                 else:
-                    print(f"      No improvement")
+                    log.debug("      No improvement")
                 
                 # Check convergence
                 if iteration > 0 and abs(prev_lap_time - lap_time) < self.CONVERGENCE_THRESHOLD:
-                    print(f"      Converged!")
+                    log.debug("      Converged!")
                     break
                 
                 # Optimize path for next iteration
                 if iteration < self.MAX_ITERATIONS - 1:
-                    print(f"      Optimizing path geometry...")
+                    log.debug("      Optimizing path geometry...")
                     current_path = self._optimize_path_geometry(racing_line, speeds, track_width)
                 
                 prev_lap_time = lap_time
             
         except Exception as e:
-            print(f"      Optimization error: {str(e)}")
+            log.warning("Optimization error: %s", e)
             # Return fallback result
             return self._calculate_single_pass_racing_line(track_points, curvature, track_width, params, friction)
         
-        print(f"\nOPTIMIZATION COMPLETED:")
-        print(f"   • Final lap time: {best_lap_time:.2f}s")
-        print(f"   • Iterations: {min(iteration + 1, self.MAX_ITERATIONS)}")
+        log.debug("OPTIMIZATION COMPLETED:")
+        log.debug("   • Final lap time: %.2fs", best_lap_time)
+        log.debug("   • Iterations: %s", min(iteration + 1, self.MAX_ITERATIONS))
         
         return best_path
     
@@ -202,26 +205,32 @@ class PhysicsBasedModel(BaseRacingLineModel):
         g = 9.81
         air_density = 1.225
         
-        for i, kappa in enumerate(curvature):
-            if abs(kappa) > 1e-6:  # Corner section
-                speeds[i] = self._calculate_corner_speed(kappa, params, friction, g, air_density)
-            else:  # Straight section
-                speeds[i] = self._calculate_straight_speed(params, air_density)
+        # Corner sections are solved together; straights share one drag-limited speed
+        is_corner = np.abs(curvature) > 1e-6
+        if is_corner.any():
+            speeds[is_corner] = self._calculate_corner_speed(
+                curvature[is_corner], params, friction, g, air_density
+            )
+        if not is_corner.all():
+            speeds[~is_corner] = self._calculate_straight_speed(params, air_density)
         
         return speeds
     
     def _calculate_corner_speed(self, kappa, params, friction, g, air_density):
         """
-        Calculate maximum cornering speed using physics
+        Calculate maximum cornering speed using physics, for one or many curvature values
         
         Formula: v_max = √(μ × (mg + F_downforce) / (m × κ))
         """
+        abs_kappa = np.abs(np.asarray(kappa, dtype=np.float64))
+        
         # Iterative solution for speed-dependent aerodynamics
-        v_estimate = 30.0  # Initial guess
+        v_estimate = np.full(abs_kappa.shape, 30.0)  # Initial guess
+        active = np.ones(abs_kappa.shape, dtype=bool)
         
         for _ in range(3):  # Quick convergence
             # Calculate aerodynamic downforce: F = 0.5 × ρ × v² × C_L × A
-            _, downforce = aerodynamic_model.calculate_aerodynamic_forces(
+            _, downforce = aerodynamic_model.calculate_aerodynamic_force_arrays(
                 v_estimate, params['frontal_area'], 
                 params['drag_coefficient'], params['lift_coefficient']
             )
@@ -233,22 +242,19 @@ class PhysicsBasedModel(BaseRacingLineModel):
             max_lateral_force = friction * total_normal_force
             
             # Maximum cornering speed: v = √(F_lat / (m × κ))
-            if abs(kappa) > 1e-10:
-                v_max_squared = max_lateral_force / (params['mass'] * abs(kappa))
-                if v_max_squared > 0:
-                    v_new = np.sqrt(v_max_squared)
-                else:
-                    v_new = 10.0
-            else:
-                v_new = 80.0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                v_max_squared = max_lateral_force / (params['mass'] * abs_kappa)
+            v_new = np.where(v_max_squared > 0, np.sqrt(np.maximum(v_max_squared, 0.0)), 10.0)
+            v_new = np.where(abs_kappa > 1e-10, v_new, 80.0)
             
-            # Check convergence
-            if abs(v_new - v_estimate) < 0.5:
+            # Check convergence; converged points keep their estimate
+            active &= np.abs(v_new - v_estimate) >= 0.5
+            if not active.any():
                 break
             
-            v_estimate = 0.7 * v_estimate + 0.3 * v_new
+            v_estimate = np.where(active, 0.7 * v_estimate + 0.3 * v_new, v_estimate)
         
-        return max(5.0, min(v_estimate, 100.0))
+        return np.clip(v_estimate, 5.0, 100.0)
     
     def _calculate_straight_speed(self, params, air_density):
         """
@@ -282,83 +288,94 @@ class PhysicsBasedModel(BaseRacingLineModel):
         
         max_offset = track_width * 0.4  # 80% track usage
         
-        for i in range(n_points):
-            if i < 5 or i > n_points - 5:
-                continue  # Skip endpoints
-            
-            current_curvature = abs(curvature[i])
-            current_speed = speeds[i]
-            
-            if current_curvature > 0.003:  # Corner section
-                offset = self._calculate_corner_offset(
-                    i, curvature, speeds, max_offset, n_points
-                )
-                offsets[i] = offset
-            else:  # Straight section
-                offset = self._calculate_straight_offset(
-                    i, curvature, speeds, max_offset, n_points, params
-                )
-                offsets[i] = offset
+        # Prefix sums of |κ| so each corner's look-ahead/behind means are O(1)
+        cum_abs_curvature = np.concatenate(([0.0], np.cumsum(np.abs(curvature))))
+        
+        # Endpoints are skipped; corners and straights are handled separately
+        interior = np.zeros(n_points, dtype=bool)
+        interior[5:max(n_points - 4, 5)] = True
+        is_corner = np.abs(curvature) > 0.003
+        
+        # Corner section
+        corner = interior & is_corner
+        offsets[corner] = self._calculate_corner_offsets(
+            curvature, speeds, max_offset, cum_abs_curvature
+        )[corner]
+        
+        # Straight section
+        straight = interior & ~is_corner
+        offsets[straight] = self._calculate_straight_offsets(
+            curvature, speeds, max_offset, params
+        )[straight]
         
         return offsets
     
-    def _calculate_corner_offset(self, i, curvature, speeds, max_offset, n_points):
-        """Calculate offset for corner sections using late apex strategy"""
+    def _calculate_corner_offsets(self, curvature, speeds, max_offset, cum_abs_curvature=None):
+        """Calculate offsets for corner sections using late apex strategy, for every point"""
+        if cum_abs_curvature is None:
+            cum_abs_curvature = np.concatenate(([0.0], np.cumsum(np.abs(curvature))))
         
-        corner_direction = -np.sign(curvature[i])
-        current_speed = speeds[i]
+        n_points = len(curvature)
+        indices = np.arange(n_points)
+        corner_direction = -np.sign(curvature)
+        current_speed = np.asarray(speeds)
         
         # Speed-based strategy
-        if current_speed < 30:  # Slow corner - maximize radius
-            speed_factor = 1.0
-        elif current_speed < 50:  # Medium corner - balanced
-            speed_factor = 0.8
-        else:  # Fast corner - minimize radius
-            speed_factor = 0.6
+        speed_factor = np.select(
+            [current_speed < 30, current_speed < 50],  # Slow corner - maximize radius, medium - balanced
+            [1.0, 0.8],
+            default=0.6  # Fast corner - minimize radius
+        )
         
         # Determine corner phase (entry/apex/exit)
-        look_ahead = min(i + 10, n_points - 1)
-        look_behind = max(i - 10, 0)
-        
-        ahead_curvature = np.mean(np.abs(curvature[i:look_ahead]))
-        behind_curvature = np.mean(np.abs(curvature[look_behind:i]))
-        current_curvature = abs(curvature[i])
-        
-        if (behind_curvature < current_curvature and ahead_curvature < current_curvature):
-            # Apex - late apex strategy
-            phase_factor = 0.9 * speed_factor
-        elif behind_curvature < current_curvature:
-            # Entry - go wide
-            phase_factor = -0.7 * speed_factor
-        else:
-            # Exit - accelerate out wide
-            phase_factor = -0.6 * speed_factor
+        look_ahead = np.minimum(indices + 10, n_points - 1)
+        look_behind = np.maximum(indices - 10, 0)
+        
+        # Window means from prefix sums (empty windows give NaN, like np.mean)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ahead_curvature = (cum_abs_curvature[look_ahead] - cum_abs_curvature[indices]) / (look_ahead - indices)
+            behind_curvature = (cum_abs_curvature[indices] - cum_abs_curvature[look_behind]) / (indices - look_behind)
+        current_curvature = np.abs(curvature)
+        
+        is_entry = behind_curvature < current_curvature
+        is_apex = is_entry & (ahead_curvature < current_curvature)
+        phase_factor = np.select(
+            [is_apex, is_entry],  # Apex - late apex strategy; entry - go wide
+            [0.9 * speed_factor, -0.7 * speed_factor],
+            default=-0.6 * speed_factor  # Exit - accelerate out wide
+        )
         
         return max_offset * phase_factor * corner_direction
     
-    def _calculate_straight_offset(self, i, curvature, speeds, max_offset, n_points, params):
-        """Calculate offset for straight sections (positioning for next corner)"""
+    def _calculate_straight_offsets(self, curvature, speeds, max_offset, params):
+        """Calculate offsets for straight sections (positioning for next corner), for every point"""
+        n_points = len(curvature)
+        indices = np.arange(n_points)
         
-        # Look ahead for upcoming corners
-        look_ahead_distance = min(15, n_points - i - 1)
+        # Look ahead for upcoming corners: index of the first corner after each point
+        corner_indices = np.where(np.abs(curvature) > 0.003, indices, n_points)
+        first_corner_from = np.minimum.accumulate(corner_indices[::-1])[::-1]
+        next_corner = np.append(first_corner_from[1:], n_points)
         
-        for j in range(i + 1, i + look_ahead_distance + 1):
-            if j < n_points and abs(curvature[j]) > 0.003:
-                # Found upcoming corner
-                corner_direction = -np.sign(curvature[j])
-                distance_to_corner = j - i
-                
-                # Calculate braking distance: d = v² / (2a)
-                braking_distance = (speeds[j] ** 2) / (2 * params['max_acceleration'])
-                
-                if distance_to_corner <= braking_distance * 0.1:
-                    # In braking zone - position for optimal entry
-                    setup_factor = 0.7 * (-corner_direction)
-                    transition = 1 - (distance_to_corner / (braking_distance * 0.1))
-                    return max_offset * setup_factor * transition
-                break
+        # Only corners within the 15-point look-ahead window count
+        distance_to_corner = next_corner - indices
+        found = (next_corner < n_points) & (distance_to_corner <= 15)
+        corner = np.where(found, next_corner, 0)
+        
+        # Found upcoming corner
+        corner_direction = -np.sign(curvature[corner])
+        
+        # Calculate braking distance: d = v² / (2a)
+        braking_distance = (np.asarray(speeds)[corner] ** 2) / (2 * params['max_acceleration'])
+        braking_zone = braking_distance * 0.1
         
-        return 0.0
+        # In braking zone - position for optimal entry
+        in_braking_zone = found & (distance_to_corner <= braking_zone)
+        setup_factor = 0.7 * (-corner_direction)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            transition = 1 - (distance_to_corner / braking_zone)
+        
+        return np.where(in_braking_zone, max_offset * setup_factor * transition, 0.0)
     
     def _apply_offsets(self, track_points, offsets):
         """Apply calculated offsets to track points to get racing line"""
@@ -366,23 +383,24 @@ class PhysicsBasedModel(BaseRacingLineModel):
         racing_line = track_points.copy()
         n_points = len(track_points)
         
-        for i in range(1, n_points - 1):
-            # Calculate perpendicular direction
-            prev_point = track_points[i-1]
-            next_point = track_points[i+1]
-            
-            # Tangent vector
-            tangent = next_point - prev_point
-            tangent_norm = np.linalg.norm(tangent)
-            
-            if tangent_norm > 1e-10:
-                tangent = tangent / tangent_norm
-                
-                # Perpendicular vector (90 degrees rotation)
-                perpendicular = np.array([-tangent[1], tangent[0]])
-                
-                # Apply offset
-                racing_line[i] = track_points[i] + offsets[i] * perpendicular
+        if n_points < 3:
+            return racing_line
+        
+        # Central-difference tangent vectors for interior points
+        tangent = track_points[2:] - track_points[:-2]
+        tangent_norm = np.hypot(tangent[:, 0], tangent[:, 1])
+        valid = tangent_norm > 1e-10
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tangent = tangent / tangent_norm[:, np.newaxis]
+        
+        # Perpendicular vector (90 degrees rotation)
+        perpendicular = tangent @ ROTATE_90
+        
+        # Apply offset where the tangent is well defined
+        interior = track_points[1:-1]
+        offset_points = interior + np.asarray(offsets[1:n_points - 1])[:, np.newaxis] * perpendicular
+        racing_line[1:-1] = np.where(valid[:, np.newaxis], offset_points, interior)
         
         return racing_line
     
@@ -393,32 +411,28 @@ class PhysicsBasedModel(BaseRacingLineModel):
         This is the optimization objective function
         """
         distances = self._calculate_distances_between_points(racing_line)
-        lap_time = 0.0
+        speeds = np.asarray(speeds, dtype=np.float64)[:len(distances)]
         
-        for i in range(len(distances)):
-            # More robust protection against division by zero
-            if speeds[i] > 1e-6 and distances[i] > 1e-6:
-                lap_time += distances[i] / speeds[i]  # time = distance / speed
-            else:
-                # Fallback for invalid data
-                lap_time += distances[i] / 10.0  # Use safe fallback speed
+        # More robust protection against division by zero:
+        # fall back to a safe speed for invalid data
+        valid = (speeds > 1e-6) & (distances > 1e-6)
+        segment_speeds = np.where(valid, speeds, 10.0)
         
-        return lap_time
+        # time = distance / speed
+        return float(np.sum(distances / segment_speeds))
     
     def _calculate_distances_between_points(self, points):
         """Calculate distances between consecutive points"""
+        points = np.asarray(points, dtype=np.float64)
         distances = np.zeros(len(points))
         
-        for i in range(len(points) - 1):
-            dx = points[i+1][0] - points[i][0]
-            dy = points[i+1][1] - points[i][1]
-            distances[i] = np.sqrt(dx**2 + dy**2)
+        segments = np.diff(points, axis=0)
+        distances[:-1] = np.hypot(segments[:, 0], segments[:, 1])
         
         # Close the loop
         if len(points) > 2:
-            dx = points[0][0] - points[-1][0]
-            dy = points[0][1] - points[-1][1]
-            distances[-1] = np.sqrt(dx**2 + dy**2)
+            closing = points[0] - points[-1]
+            distances[-1] = np.hypot(closing[0], closing[1])
         
         return distances
     
@@ -431,21 +445,19 @@ class PhysicsBasedModel(BaseRacingLineModel):
         optimized_path = racing_line.copy()
         n_points = len(racing_line)
         
-        # Apply smoothing based on speed
-        for i in range(2, n_points - 2):
-            if speeds[i] > 40.0:  # High-speed sections
-                # Apply smoothing to reduce curvature
-                prev_point = racing_line[i-1]
-                current_point = racing_line[i]
-                next_point = racing_line[i+1]
-                
-                # Simple 3-point smoothing
-                smooth_x = (prev_point[0] + 2 * current_point[0] + next_point[0]) / 4
-                smooth_y = (prev_point[1] + 2 * current_point[1] + next_point[1]) / 4
-                
-                # Blend with original (30% smoothing)
-                weight = 0.3
-                optimized_path[i][0] = (1 - weight) * current_point[0] + weight * smooth_x
-                optimized_path[i][1] = (1 - weight) * current_point[1] + weight * smooth_y
+        if n_points < 5:
+            return optimized_path
+        
+        # Apply smoothing based on speed (interior points, reading the unmodified line)
+        current_points = racing_line[2:n_points - 2]
+        high_speed = np.asarray(speeds[2:n_points - 2]) > 40.0  # High-speed sections
+        
+        # Simple 3-point smoothing to reduce curvature
+        smooth_points = (racing_line[1:n_points - 3] + 2 * current_points + racing_line[3:n_points - 1]) / 4
+        
+        # Blend with original (30% smoothing)
+        weight = 0.3
+        blended = (1 - weight) * current_points + weight * smooth_points
+        optimized_path[2:n_points - 2] = np.where(high_speed[:, np.newaxis], blended, current_points)
         
         return optimized_path
\ No newline at end of file
@@ -2,14 +2,46 @@
 Curvilinear Coordinate System for Track-Relative Vehicle Dynamics
 Based on Oxford Research Paper differential geometry approach
 """
+import logging
 import numpy as np
 from typing import Tuple, NamedTuple, Optional
 from scipy.interpolate import interp1d
+from scipy.ndimage import gaussian_filter1d
 try:
     from scipy.integrate import cumtrapz
 except ImportError:
     # For newer SciPy versions (>= 1.12.0)
     from scipy.integrate import cumulative_trapezoid as cumtrapz
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba is optional - the curvature then uses the NumPy implementation
+    NUMBA_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+
+def _curvature_kernel(track_angles, s_points, curvature):
+    """Inverse-distance weighted central difference dθ/ds at interior points, in place"""
+    n_points = track_angles.shape[0]
+    
+    for i in range(1, n_points - 1):
+        ds_forward = s_points[i+1] - s_points[i]
+        ds_backward = s_points[i] - s_points[i-1]
+        
+        if ds_forward > 0 and ds_backward > 0:
+            weight_forward = 1.0 / ds_forward
+            weight_backward = 1.0 / ds_backward
+            curvature[i] = (weight_forward * (track_angles[i+1] - track_angles[i]) / ds_forward +
+                            weight_backward * (track_angles[i] - track_angles[i-1]) / ds_backward) / \
+                           (weight_forward + weight_backward)
+    
+    return curvature
+
+
+if NUMBA_AVAILABLE:
+    _curvature_kernel = njit(cache=True, fastmath=True)(_curvature_kernel)
 
 
 class CurvilinearState(NamedTuple):
@@ -30,6 +62,7 @@ class TrackGeometry(NamedTuple):
     tangent_vectors: np.ndarray    # Track tangent vectors t(s)
     normal_vectors: np.ndarray     # Track normal vectors n(s)
     track_width: float        # Half-width of track
+    track_angles: np.ndarray  # Unwrapped track heading θ(s) at each point
 
 
 class CurvilinearCoordinateSystem:
@@ -59,25 +92,45 @@ class CurvilinearCoordinateSystem:
     def _calculate_track_geometry(self) -> TrackGeometry:
         """Calculate fundamental track geometric properties"""
         
+        # Work on contiguous x/y arrays rather than strided columns
+        x = np.ascontiguousarray(self.track_centerline[:, 0], dtype=np.float64)
+        y = np.ascontiguousarray(self.track_centerline[:, 1], dtype=np.float64)
+        dx = np.diff(x)
+        dy = np.diff(y)
+        
+        # Calculate distance along centerline
+        n_points = len(x)
+        segment_lengths = np.sqrt(dx * dx + dy * dy)
+        s_points = np.empty(n_points)
+        s_points[0] = 0.0
+        np.cumsum(segment_lengths, out=s_points[1:])
+        
         # Calculate tangent vectors (track direction)
-        tangent_vectors = np.diff(self.track_centerline, axis=0)
-        # Add final point to match array size
-        tangent_vectors = np.vstack([tangent_vectors, tangent_vectors[-1]])
+        # Repeat the final segment to match array size, filling preallocated buffers
+        tangent_norms = np.empty(n_points)
+        tangent_norms[:-1] = segment_lengths
+        tangent_norms[-1] = segment_lengths[-1]
+        tangent_norms[tangent_norms == 0] = 1  # Avoid division by zero
         
         # Normalize tangent vectors
-        tangent_norms = np.linalg.norm(tangent_vectors, axis=1)
-        tangent_norms = np.where(tangent_norms == 0, 1, tangent_norms)  # Avoid division by zero
-        tangent_vectors = tangent_vectors / tangent_norms[:, np.newaxis]
+        tangent_vectors = np.empty((n_points, 2))
+        tangent_vectors[:-1, 0] = dx
+        tangent_vectors[:-1, 1] = dy
+        tangent_vectors[-1] = tangent_vectors[-2]
+        tangent_vectors /= tangent_norms[:, np.newaxis]
+        tangent_x = tangent_vectors[:, 0]
+        tangent_y = tangent_vectors[:, 1]
         
         # Calculate normal vectors (perpendicular to track)
-        normal_vectors = np.array([-tangent_vectors[:, 1], tangent_vectors[:, 0]]).T
+        normal_vectors = np.empty((n_points, 2))
+        normal_vectors[:, 0] = -tangent_y
+        normal_vectors[:, 1] = tangent_x
         
-        # Calculate distance along centerline
-        segment_lengths = np.linalg.norm(np.diff(self.track_centerline, axis=0), axis=1)
-        s_points = np.concatenate([[0], np.cumsum(segment_lengths)])
+        # Calculate track angle θ(s), handling angle wraparound
+        track_angles = np.unwrap(np.arctan2(tangent_y, tangent_x))
         
         # Calculate curvature κ(s)
-        curvature = self._calculate_curvature(tangent_vectors, s_points)
+        curvature = self._calculate_curvature(track_angles, s_points)
         
         return TrackGeometry(
             s_points=s_points,
@@ -85,45 +138,46 @@ class CurvilinearCoordinateSystem:
             centerline=self.track_centerline,
             tangent_vectors=tangent_vectors,
             normal_vectors=normal_vectors,
-            track_width=self.track_width
+            track_width=self.track_width,
+            track_angles=track_angles
         )
     
-    def _calculate_curvature(self, tangent_vectors: np.ndarray, s_points: np.ndarray) -> np.ndarray:
+    def _calculate_curvature(self, track_angles: np.ndarray, s_points: np.ndarray) -> np.ndarray:
         """
         Calculate track curvature κ(s) = dθ/ds
         
         Args:
-            tangent_vectors: Normalized tangent vectors
+            track_angles: Unwrapped track heading θ(s)
             s_points: Distance points along centerline
             
         Returns:
             Curvature array κ(s)
         """
-        # Calculate track angle θ(s)
-        track_angles = np.arctan2(tangent_vectors[:, 1], tangent_vectors[:, 0])
-        
-        # Handle angle wraparound
-        track_angles = np.unwrap(track_angles)
-        
         # Calculate curvature as dθ/ds
         curvature = np.zeros_like(track_angles)
         
-        for i in range(1, len(track_angles) - 1):
+        if NUMBA_AVAILABLE and len(track_angles) > 2:
+            # Fused compiled loop over the interior points
+            _curvature_kernel(np.ascontiguousarray(track_angles, dtype=np.float64),
+                              np.ascontiguousarray(s_points, dtype=np.float64), curvature)
+        elif len(track_angles) > 2:
             # Central difference for interior points
-            ds_forward = s_points[i+1] - s_points[i]
-            ds_backward = s_points[i] - s_points[i-1]
+            ds = np.diff(s_points)
+            dtheta = np.diff(track_angles)
+            ds_forward, ds_backward = ds[1:], ds[:-1]
+            dtheta_forward, dtheta_backward = dtheta[1:], dtheta[:-1]
+            valid = (ds_forward > 0) & (ds_backward > 0)
             
-            if ds_forward > 0 and ds_backward > 0:
-                dtheta_forward = track_angles[i+1] - track_angles[i]
-                dtheta_backward = track_angles[i] - track_angles[i-1]
-                
+            with np.errstate(divide='ignore', invalid='ignore'):
                 # Weighted average for better numerical stability
                 weight_forward = 1.0 / ds_forward
                 weight_backward = 1.0 / ds_backward
                 total_weight = weight_forward + weight_backward
                 
-                curvature[i] = (weight_forward * dtheta_forward / ds_forward + 
-                              weight_backward * dtheta_backward / ds_backward) / total_weight
+                interior = (weight_forward * dtheta_forward / ds_forward +
+                            weight_backward * dtheta_backward / ds_backward) / total_weight
+            
+            curvature[1:-1] = np.where(valid, interior, 0.0)
         
         # Handle boundary points
         if len(curvature) > 2:
@@ -131,7 +185,6 @@ class CurvilinearCoordinateSystem:
             curvature[-1] = curvature[-2]
         
         # Smooth curvature to reduce numerical noise
-        from scipy.ndimage import gaussian_filter1d
         curvature = gaussian_filter1d(curvature, sigma=1.0)
         
         return curvature
@@ -149,8 +202,9 @@ class CurvilinearCoordinateSystem:
             Tuple of (s, n, xi) curvilinear coordinates
         """
         # Find closest point on track centerline
-        distances = np.linalg.norm(self.track_centerline - global_position, axis=1)
-        closest_idx = np.argmin(distances)
+        # (squared distances give the same argmin without the square roots)
+        offsets = self.track_centerline - global_position
+        closest_idx = np.argmin(np.einsum('ij,ij->i', offsets, offsets))
         
         # Get distance along centerline (s coordinate)
         s = self.track_geometry.s_points[closest_idx]
@@ -165,8 +219,7 @@ class CurvilinearCoordinateSystem:
         
         # Calculate relative angle (ξ coordinate)
         # Track heading at this point
-        track_tangent = self.track_geometry.tangent_vectors[closest_idx]
-        track_heading = np.arctan2(track_tangent[1], track_tangent[0])
+        track_heading = self.track_geometry.track_angles[closest_idx]
         
         # Relative angle between vehicle and track
         xi = global_heading - track_heading
@@ -174,7 +227,7 @@ class CurvilinearCoordinateSystem:
         # Normalize xi to [-π, π]
         xi = np.arctan2(np.sin(xi), np.cos(xi))
         
-        print(f"         ✅ Curvilinear result: s={s:.2f}, n={n:.2f}, ξ={xi:.3f}")
+        log.debug("         ✅ Curvilinear result: s=%.2f, n=%.2f, ξ=%.3f", s, n, xi)
         return s, n, xi
     
     def transform_to_global(self, s: float, n: float, xi: float) -> Tuple[np.ndarray, float]:
@@ -228,13 +281,11 @@ class CurvilinearCoordinateSystem:
         Returns:
             State derivatives (ṡ, ṅ, ξ̇, s̈, n̈, ξ̈)
         """
-        s, n, xi, s_dot_prev, n_dot_prev, xi_dot_prev = curvilinear_state
+        s, n, xi = curvilinear_state[:3]
         u, v, omega = velocity_components
         
         # Get curvature at current position
-        curvature_interp = interp1d(self.track_geometry.s_points,
-                                  self.track_geometry.curvature, kind='linear')
-        C = float(curvature_interp(max(0, min(s, self.track_geometry.s_points[-1]))))
+        C = self._curvature_at(s)
         
         # Research paper equations (1-3):
         # ṡ = (u cos ξ - v sin ξ) / (1 - nC)
@@ -257,6 +308,51 @@ class CurvilinearCoordinateSystem:
         
         return CurvilinearState(s_dot, n_dot, xi_dot, s_ddot, n_ddot, xi_ddot)
     
+    def _curvature_at(self, s: float) -> float:
+        """Track curvature at distance s (linear interpolation, clamped to the track)"""
+        s_points = self.track_geometry.s_points
+        return float(np.interp(max(0, min(s, s_points[-1])), s_points, self.track_geometry.curvature))
+    
+    def kinematic_derivs(self, s: float, n: float, xi: float, u: float, v: float, omega: float,
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Array form of the kinematic equations for integrator hot paths
+        
+        Args:
+            s, n, xi: Curvilinear position and relative angle
+            u, v, omega: Longitudinal velocity, lateral velocity and yaw rate
+            out: Optional preallocated float64 array of length 6 to write into
+            
+        Returns:
+            Array of state derivatives (ṡ, ṅ, ξ̇, s̈, n̈, ξ̈)
+        """
+        if out is None:
+            out = np.zeros(6, dtype=np.float64)
+        
+        # Get curvature at current position
+        C = self._curvature_at(s)
+        
+        # Research paper equations (1-3):
+        # ṡ = (u cos ξ - v sin ξ) / (1 - nC)
+        denominator = 1.0 - n * C
+        if abs(denominator) < 1e-6:
+            denominator = 1e-6  # Avoid singularity
+        
+        cos_xi = np.cos(xi)
+        sin_xi = np.sin(xi)
+        s_dot = (u * cos_xi - v * sin_xi) / denominator
+        
+        out[0] = s_dot
+        # ṅ = u sin ξ + v cos ξ
+        out[1] = u * sin_xi + v * cos_xi
+        # ξ̇ = ψ̇ - Cṡ = ω - C*s_dot
+        out[2] = omega - C * s_dot
+        
+        # For derivatives, we'd need acceleration components (not implemented yet)
+        out[3:] = 0.0  # Placeholder
+        
+        return out
+    
     def get_track_properties_at_s(self, s: float) -> dict:
         """
         Get track properties at a specific distance s
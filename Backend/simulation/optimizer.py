@@ -1,11 +1,13 @@
 """
 Racing line optimizer with separated model architecture
 """
+import math
+import logging
+import functools
 import numpy as np
-from scipy.optimize import minimize
-from scipy.interpolate import splprep, splev
-from typing import List, Tuple, Dict
-from schemas.track import Car
+from scipy.interpolate import splprep, splev, CubicSpline
+from typing import Callable, List, NamedTuple, Optional, Tuple, Dict
+from schemas.track import Car, Track, TrackPoint
 from scipy.ndimage import gaussian_filter1d
 from enum import Enum
 
@@ -13,7 +15,19 @@ from enum import Enum
 from .algorithms.physics_model import PhysicsBasedModel
 from .algorithms.basic_model import BasicModel
 from .algorithms.kapania_model import KapaniaModel
-from .aerodynamics import aerodynamic_model, get_speed_dependent_coefficients
+from .algorithms.base_model import split_xy, track_frame
+from .aerodynamics import aerodynamic_model
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba is optional - compute_curvature falls back to the NumPy implementation
+    NUMBA_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+__all__ = ['optimize_racing_line', 'compute_curvature', 'get_available_models', 'warm_up', 'RacingLineModel']
 
 class RacingLineModel(str, Enum):
     """Available racing line calculation models"""
@@ -21,6 +35,12 @@ class RacingLineModel(str, Enum):
     BASIC = "basic"
     TWO_STEP_ALGORITHM = "two_step_algorithm"
 
+# Gaussian passes applied to every separated racing line, in order
+SEPARATED_LINE_SIGMAS = (1.0, 1.5, 2.0)
+
+# Separated lines are only generated for this many cars
+MAX_SEPARATED_CARS = 6
+
 # Initialize model instances
 MODELS = {
     RacingLineModel.PHYSICS_BASED: PhysicsBasedModel(),
@@ -28,74 +48,160 @@ MODELS = {
     RacingLineModel.TWO_STEP_ALGORITHM: KapaniaModel()
 }
 
+def _is_closed(points: np.ndarray, atol: float = 1e-3) -> bool:
+    """Scalar equivalent of np.allclose(points[0], points[-1], atol=atol)"""
+    x0, y0 = points[0, 0], points[0, 1]
+    x1, y1 = points[-1, 0], points[-1, 1]
+    return (abs(x0 - x1) <= atol + 1e-5 * abs(x1)) and (abs(y0 - y1) <= atol + 1e-5 * abs(y1))
+
+def _close_loop(points: np.ndarray, atol: float = 1e-3) -> np.ndarray:
+    """Return points unchanged if closed, otherwise a copy with the first point appended"""
+    if _is_closed(points, atol):
+        return points
+    n = points.shape[0]
+    closed = np.empty((n + 1, 2), dtype=np.float64)
+    closed[:n] = points
+    closed[n] = points[0]
+    return closed
+
+@functools.lru_cache(maxsize=32)
+def _fit_periodic_spline(points_bytes: bytes, n: int):
+    """
+    Fit a periodic interpolating spline through closed track points.
+    Cached on the raw point bytes so re-optimizing the same track skips the fit.
+    """
+    points = np.frombuffer(points_bytes, dtype=np.float64).reshape(n, 2)
+    # Periodic boundary conditions need an exact repeat of the first point
+    if _is_closed(points):
+        # Closed to within tolerance - snap the end point (as splprep(per=True) does)
+        # rather than appending a near-duplicate that would repeat the final knot
+        points = points.copy()
+        points[-1] = points[0]
+    else:
+        points = np.vstack([points, points[0]])
+    
+    # Normalized chord-length parameter, as splprep uses by default
+    chord_lengths = np.hypot(*split_xy(np.diff(points, axis=0)))
+    u = np.concatenate(([0.0], np.cumsum(chord_lengths)))
+    u /= u[-1]
+    return CubicSpline(u, points, bc_type='periodic')
+
+@functools.lru_cache(maxsize=32)
+def _u_grid(num_points: int, endpoint: bool = False) -> np.ndarray:
+    """
+    Spline parameter grid over [0, 1) (or [0, 1] with endpoint) with num_points samples.
+    Shared between calls, so it is returned read-only.
+    """
+    if endpoint:
+        grid = np.linspace(0, 1, num_points)
+    else:
+        grid = np.linspace(0, 1, num_points + 1)[:-1]  # Exclude the last point to avoid duplication
+    grid.flags.writeable = False
+    return grid
+
 def resample_track_points(points: np.ndarray, num_points: int = 50) -> np.ndarray:
     """
     Resample track points to reduce computational complexity while maintaining track shape.
     Ensures the track is treated as a closed loop and preserves the start/finish position.
     """
     # Convert points to numpy array if not already
-    points = np.array(points)
+    points = np.array(points, dtype=np.float64)
     
-    # Check if track is already closed (last point same as first)
-    is_closed = np.allclose(points[0], points[-1], atol=1e-3)
-    
-    if not is_closed:
-        # Close the track by adding the first point at the end
-        points = np.vstack([points, points[0]])
+    # Close the track by adding the first point at the end if needed
+    points = _close_loop(points)
     
     # For closed tracks, use periodic spline fitting
     try:
         # Use periodic spline for closed tracks
-        tck, u = splprep([points[:,0], points[:,1]], s=0, per=True)
+        spline = _fit_periodic_spline(points.tobytes(), points.shape[0])
         
         # Generate new points along the spline, ensuring we start at u=0 (original start position)
-        u_new = np.linspace(0, 1, num_points + 1)[:-1]  # Exclude the last point to avoid duplication
-        x_new, y_new = splev(u_new, tck)
-        
-        resampled_points = np.column_stack((x_new, y_new))
-        
-        # Ensure the track is properly closed by adding the first point at the end
-        resampled_points = np.vstack([resampled_points, resampled_points[0]])
+        # Write straight into the closed buffer, repeating the first point at the end
+        resampled_points = np.empty((num_points + 1, 2), dtype=np.float64)
+        resampled_points[:num_points] = spline(_u_grid(num_points))
+        resampled_points[num_points] = resampled_points[0]
         
         return resampled_points
         
     except Exception as e:
-        print(f"Periodic spline fitting failed: {e}. Falling back to non-periodic.")
+        log.warning("Periodic spline fitting failed: %s. Falling back to non-periodic.", e)
         # Fallback to non-periodic spline if periodic fails
-        tck, u = splprep([points[:,0], points[:,1]], s=0, per=False)
-        u_new = np.linspace(0, 1, num_points)
-        x_new, y_new = splev(u_new, tck)
-        
-        resampled_points = np.column_stack((x_new, y_new))
+        tck, u = splprep(list(split_xy(points)), s=0, per=False)
+        x_new, y_new = splev(_u_grid(num_points, endpoint=True), tck)
         
         # Ensure the track is closed
-        if not np.allclose(resampled_points[0], resampled_points[-1], atol=1e-3):
-            resampled_points = np.vstack([resampled_points, resampled_points[0]])
+        resampled_points = _close_loop(np.column_stack((x_new, y_new)))
         
         return resampled_points
 
+def _gradient_at(f, i, n):
+    """np.gradient of f evaluated at index i (one-sided differences at the ends)"""
+    if i == 0:
+        return f[1] - f[0]
+    if i == n - 1:
+        return f[n - 1] - f[n - 2]
+    return 0.5 * (f[i + 1] - f[i - 1])
+
+def _second_gradient_at(f, i, n):
+    """np.gradient(np.gradient(f)) evaluated at index i"""
+    if i == 0:
+        return _gradient_at(f, 1, n) - _gradient_at(f, 0, n)
+    if i == n - 1:
+        return _gradient_at(f, n - 1, n) - _gradient_at(f, n - 2, n)
+    return 0.5 * (_gradient_at(f, i + 1, n) - _gradient_at(f, i - 1, n))
+
+def _compute_curvature_kernel(x, y, out):
+    """Fused single-pass curvature: reads x/y once and writes out once"""
+    n = x.shape[0]
+    for i in range(n):
+        dx_dt = _gradient_at(x, i, n)
+        dy_dt = _gradient_at(y, i, n)
+        d2x_dt2 = _second_gradient_at(x, i, n)
+        d2y_dt2 = _second_gradient_at(y, i, n)
+        
+        numerator = abs(dx_dt * d2y_dt2 - dy_dt * d2x_dt2)
+        denominator = (dx_dt * dx_dt + dy_dt * dy_dt)**1.5
+        out[i] = numerator / max(denominator, 1e-10)
+    return out
+
+if NUMBA_AVAILABLE:
+    _gradient_at = njit(cache=True, fastmath=True)(_gradient_at)
+    _second_gradient_at = njit(cache=True, fastmath=True)(_second_gradient_at)
+    _compute_curvature_kernel = njit(cache=True, fastmath=True)(_compute_curvature_kernel)
+
 def compute_curvature(points: np.ndarray) -> np.ndarray:
     """
     Compute the curvature at each point of the racing line with robust NaN handling
     """
-    # Calculate first derivatives
-    dx_dt = np.gradient(points[:, 0])
-    dy_dt = np.gradient(points[:, 1])
-    
-    # Calculate second derivatives
-    d2x_dt2 = np.gradient(dx_dt)
-    d2y_dt2 = np.gradient(dy_dt)
-    
-    # Calculate curvature using the formula: κ = |x'y'' - y'x''| / (x'² + y'²)^(3/2)
-    numerator = np.abs(dx_dt * d2y_dt2 - dy_dt * d2x_dt2)
-    denominator = (dx_dt * dx_dt + dy_dt * dy_dt)**1.5
-    
-    # Handle division by zero and very small denominators
-    safe_denominator = np.where(denominator < 1e-10, 1e-10, denominator)
-    curvature = numerator / safe_denominator
+    x, y = split_xy(points)
+    if NUMBA_AVAILABLE and len(x) >= 2:
+        curvature = _compute_curvature_kernel(x, y, np.empty(len(x)))
+    else:
+        # Calculate first derivatives
+        dx_dt = np.gradient(x)
+        dy_dt = np.gradient(y)
+        
+        # Calculate second derivatives
+        d2x_dt2 = np.gradient(dx_dt)
+        d2y_dt2 = np.gradient(dy_dt)
+        
+        # Calculate curvature using the formula: κ = |x'y'' - y'x''| / (x'² + y'²)^(3/2)
+        # Two reused buffers instead of a fresh temporary per operation
+        numerator = np.multiply(dx_dt, d2y_dt2)
+        denominator = np.multiply(dy_dt, d2x_dt2)
+        np.subtract(numerator, denominator, out=numerator)
+        np.abs(numerator, out=numerator)
+        
+        np.multiply(dx_dt, dx_dt, out=denominator)
+        denominator += dy_dt * dy_dt
+        np.power(denominator, 1.5, out=denominator)
+        
+        # Handle division by zero and very small denominators
+        np.maximum(denominator, 1e-10, out=denominator)
+        curvature = np.divide(numerator, denominator, out=numerator)
     
     # Replace any NaN or infinite values with zeros
-    curvature = np.where(np.isfinite(curvature), curvature, 0.0)
+    np.nan_to_num(curvature, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
     
     return curvature
 
@@ -104,98 +210,68 @@ def calculate_max_entry_speed(curvature: float, friction: float, car: Car) -> fl
     Calculate the maximum entry speed for a corner based on REAL vehicle dynamics
     Now properly accounts for car mass, downforce, and acceleration capabilities!
     """
-    # Handle invalid curvature values
-    if not np.isfinite(curvature) or abs(curvature) < 1e-10:
-        # Straight line - limited by car's top speed capability
-        return min(80.0, np.sqrt(car.max_acceleration * 100))  # Rough top speed estimate
-        
+    return float(calculate_max_entry_speed_array(np.array([curvature]), friction, car)[0])
+
+class CarConstants(NamedTuple):
+    """Plain-float snapshot of the car parameters used by the speed calculations"""
+    mass: float
+    length: float
+    max_steering_angle: float
+    max_acceleration: float
+    drag_coefficient: float
+    lift_coefficient: float
+    frontal_area: float
+    
+    @property
+    def min_turn_radius(self) -> float:
+        """Minimum turn radius from vehicle geometry and steering limit"""
+        max_steering_rad = math.radians(self.max_steering_angle)
+        wheelbase = self.length * 0.6  # Approximate wheelbase as 60% of car length
+        return wheelbase / math.tan(max_steering_rad) if max_steering_rad > 0 else 1000.0
+
+def _car_constants(car: Car) -> CarConstants:
+    """Read the car's attributes once into a hashable tuple of floats"""
+    return CarConstants(
+        mass=float(car.mass),
+        length=float(car.length),
+        max_steering_angle=float(car.max_steering_angle),
+        max_acceleration=float(car.max_acceleration),
+        drag_coefficient=float(getattr(car, 'drag_coefficient', 1.0)),
+        lift_coefficient=float(getattr(car, 'lift_coefficient', 3.0)),
+        frontal_area=float(car.effective_frontal_area)
+    )
+
+def _car_speed_kernel(car: Car, friction: float) -> Callable[[np.ndarray], np.ndarray]:
+    """Maximum entry speed function for one car on one surface"""
+    return _speed_kernel(_car_constants(car), float(friction))
+
+@functools.lru_cache(maxsize=64)
+def _speed_kernel(car: CarConstants, friction: float) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Build the maximum entry speed function for one car on one surface
+    
+    Everything that does not depend on curvature (steering limit, mass and
+    acceleration scaling, aero coefficients) is evaluated once here; the
+    returned function only does the per-point array work. Cached on the
+    car constants, so re-optimizing with the same car reuses it.
+    """
     g = 9.81  # gravitational acceleration
-    rho = 1.225  # air density (kg/m³)
     
     # Use car's actual parameters
     mass = car.mass
-    Cl = getattr(car, 'lift_coefficient', 3.0)
-    Cd = getattr(car, 'drag_coefficient', 1.0)
-    A = car.effective_frontal_area
+    Cl = car.lift_coefficient
+    Cd = car.drag_coefficient
+    A = car.frontal_area
     
     # Ensure all values are finite
-    if not all(np.isfinite([Cl, Cd, A, mass])):
-        return 10.0  # Return safe fallback speed
-    
-    # Convert steering angle to radians
-    max_steering_rad = np.deg2rad(car.max_steering_angle)
+    if not all(math.isfinite(value) for value in (Cl, Cd, A, mass)):
+        return lambda curvature: np.full(np.shape(curvature), 10.0)  # Return safe fallback speed
     
-    # Calculate minimum turn radius based on vehicle geometry and steering limit
-    wheelbase = car.length * 0.6  # Approximate wheelbase as 60% of car length
-    min_turn_radius = wheelbase / np.tan(max_steering_rad) if max_steering_rad > 0 else 1000.0
+    # Straight-line speed limited by car's top speed capability
+    straight_speed = min(80.0, np.sqrt(car.max_acceleration * 100))  # Rough top speed estimate
     
-    # Current turn radius from curvature
-    current_turn_radius = 1.0 / abs(curvature) if abs(curvature) > 1e-10 else 1000.0
-    
-    # Check if the corner is too tight for the car's steering capability
-    if current_turn_radius < min_turn_radius:
-        limited_speed = min(15.0, np.sqrt(friction * g * current_turn_radius))
-        return limited_speed
-    
-    # ADVANCED PHYSICS: Speed-dependent aerodynamics + drag integration
-    # Start with estimated speed for iterative aerodynamic calculation
-    v_estimate = 30.0 if abs(curvature) > 1e-10 else 60.0  # Different initial guess for corners vs straights
-    
-    for iteration in range(5):  # More iterations for speed-dependent convergence
-        # Get speed-dependent aerodynamic coefficients from research paper
-        aero_coeffs = get_speed_dependent_coefficients(v_estimate)
-        
-        # Apply car's base coefficients as scaling factors
-        effective_drag = aero_coeffs.drag_coefficient * (Cd / 1.0)  # Scale from baseline
-        effective_lift = aero_coeffs.lift_coefficient * (Cl / 3.0)  # Scale from baseline
-        
-        # Calculate aerodynamic forces with speed-dependent coefficients
-        drag_force, downforce = aerodynamic_model.calculate_aerodynamic_forces(
-            v_estimate, A, Cd, Cl
-        )
-        
-        # Iteration debug removed
-        
-        if abs(curvature) > 1e-10:  # Cornering - limited by lateral grip
-            # Total normal force = Weight + Downforce  
-            total_normal_force = mass * g + downforce
-            
-            # Maximum lateral force from friction: F_lat = μ * N
-            max_lateral_force = friction * total_normal_force
-            
-            # Centripetal force equation: F = m * v² / r = m * v² * κ
-            v_max_squared = max_lateral_force / (mass * abs(curvature))
-            
-            if v_max_squared > 0:
-                v_new = np.sqrt(v_max_squared)
-            else:
-                v_new = 10.0
-                
-        else:  # Straight section - limited by drag vs driving force
-            # Maximum driving force approximation (based on acceleration capability)
-            max_drive_force = mass * car.max_acceleration * 0.8  # 80% of max acceleration
-            
-            # On straights, speed is limited by drag force balance
-            # F_drive = F_drag at top speed
-            if drag_force > 0:
-                # If drag force exceeds driving capability, reduce speed
-                if drag_force > max_drive_force:
-                    # Solve for speed where F_drag = F_drive
-                    v_new = aerodynamic_model.calculate_drag_limited_speed(
-                        max_drive_force, A, Cd
-                    )
-                else:
-                    # Can maintain or increase speed
-                    v_new = min(v_estimate * 1.1, 100.0)  # Gradual increase up to reasonable limit
-            else:
-                v_new = 80.0  # Fallback for straight sections
-        
-        # Check for convergence
-        if abs(v_new - v_estimate) < 0.3:  # Converged within 0.3 m/s
-            break
-            
-        # Damped update to prevent oscillation
-        v_estimate = 0.6 * v_estimate + 0.4 * v_new
+    # Steering-limited minimum turn radius, fixed for the car
+    min_turn_radius = car.min_turn_radius
     
     # Mass-dependent speed scaling
     # Heavier cars are penalized due to:
@@ -210,21 +286,67 @@ def calculate_max_entry_speed(curvature: float, friction: float, car: Car) -> fl
     reference_acceleration = 5.0  # FIXED: Use frontend default as reference acceleration
     accel_boost = np.sqrt(car.max_acceleration / reference_acceleration)
     
-    # Final speed calculation with physics factors
-    physics_speed = v_estimate * mass_penalty * accel_boost
+    # Speed-independent parts of v² = μ(mg + downforce) / (mκ)
+    weight = mass * g
+    friction_per_mass = friction / mass
     
-    # Safety factor and bounds
-    final_speed = max(5.0, min(100.0, 0.85 * physics_speed))
-    
-    # Get final aerodynamic data for output
-    final_aero = get_speed_dependent_coefficients(v_estimate)
-    final_drag, final_downforce = aerodynamic_model.calculate_aerodynamic_forces(
-        v_estimate, A, Cd, Cl
-    )
+    def speeds(curvature: np.ndarray) -> np.ndarray:
+        curvature = np.asarray(curvature, dtype=np.float64)
+        abs_curvature = np.abs(curvature)
+        
+        # Invalid curvature values are treated as straight line
+        is_straight = ~np.isfinite(curvature) | (abs_curvature < 1e-10)
+        corner_curvature = np.where(is_straight, 1.0, abs_curvature)
+        
+        # Current turn radius from curvature
+        current_turn_radius = 1.0 / corner_curvature
+        
+        # Corners too tight for the car's steering capability
+        too_tight = current_turn_radius < min_turn_radius
+        limited_speeds = np.minimum(15.0, np.sqrt(friction * g * current_turn_radius))
+        
+        # ADVANCED PHYSICS: Speed-dependent aerodynamics
+        # Iterate all points together; points stop updating once they have converged.
+        # Downforce depends on speed through the aero map, so the iteration itself stays.
+        v_estimate = np.full(curvature.shape, 30.0)
+        active = np.ones(curvature.shape, dtype=bool)
+        v_squared_per_newton = friction_per_mass / corner_curvature
+        
+        for iteration in range(5):  # More iterations for speed-dependent convergence
+            _, downforce = aerodynamic_model.calculate_aerodynamic_force_arrays(
+                v_estimate, A, Cd, Cl
+            )
+            
+            # Total normal force = Weight + Downforce, lateral grip F_lat = μ * N
+            # Centripetal force equation: F = m * v² / r = m * v² * κ
+            v_max_squared = v_squared_per_newton * (weight + downforce)
+            v_new = np.where(v_max_squared > 0, np.sqrt(np.maximum(v_max_squared, 0.0)), 10.0)
+            
+            # Check for convergence (within 0.3 m/s)
+            active &= np.abs(v_new - v_estimate) >= 0.3
+            if not active.any():
+                break
+            
+            # Damped update to prevent oscillation
+            v_estimate = np.where(active, 0.6 * v_estimate + 0.4 * v_new, v_estimate)
+        
+        # Final speed calculation with physics factors, safety factor and bounds
+        final_speeds = np.clip(0.85 * v_estimate * mass_penalty * accel_boost, 5.0, 100.0)
+        final_speeds = np.where(np.isfinite(final_speeds), final_speeds, 10.0)
+        
+        final_speeds = np.where(too_tight, limited_speeds, final_speeds)
+        return np.where(is_straight, straight_speed, final_speeds)
     
-    # Speed calculation complete
+    return speeds
+
+def calculate_max_entry_speed_array(curvature: np.ndarray, friction: float, car: Car) -> np.ndarray:
+    """
+    Vectorized maximum entry speed for every point of a curvature array
     
-    return final_speed if np.isfinite(final_speed) else 10.0
+    Applies the same grip, steering and aerodynamic limits as
+    calculate_max_entry_speed to the whole array at once.
+    """
+    return _car_speed_kernel(car, friction)(curvature)
 
 def calculate_speed_profile(
     racing_line: np.ndarray,
@@ -236,69 +358,165 @@ def calculate_speed_profile(
     Calculate the speed profile along the racing line
     """
     n_points = len(racing_line)
-    speeds = np.zeros(n_points)
     
     # Calculate segment lengths
-    segments = np.diff(racing_line, axis=0)
-    segment_lengths = np.linalg.norm(segments, axis=1)
+    segment_x, segment_y = split_xy(np.diff(racing_line, axis=0))
+    segment_lengths = np.hypot(segment_x, segment_y)
     
     # Ensure no zero-length segments
     segment_lengths = np.maximum(segment_lengths, 0.1)
     
-    # Calculate maximum speeds for each point
-    for i in range(n_points):
-        speeds[i] = calculate_max_entry_speed(curvature[i], friction, car)
+    # Calculate maximum speeds for all points at once
+    speeds = _car_speed_kernel(car, friction)(curvature[:n_points])
     
-    # Apply smoothing to speed profile
-    try:
+    # Apply smoothing to speed profile with the cached filter matrix. A matrix product
+    # would spread a non-finite value over the whole lap, so those profiles keep the
+    # local filter (non-finite values are cleaned up below)
+    if np.isfinite(speeds).all():
+        speeds = _gaussian_operator(2.0, len(speeds), 'reflect') @ speeds
+    else:
         speeds = gaussian_filter1d(speeds, sigma=2.0)
-    except:
-        pass
     
     # Ensure speeds are finite and positive
     speeds = np.where(np.isfinite(speeds), speeds, 10.0)
     speeds = np.maximum(speeds, 1.0)
     
     # Calculate lap time
-    lap_time = 0.0
-    for i in range(len(segment_lengths)):
-        if speeds[i] > 0:
-            lap_time += segment_lengths[i] / speeds[i]
+    segment_speeds = np.maximum(speeds[:len(segment_lengths)], 1e-3)
+    lap_time = float((segment_lengths / segment_speeds).sum())
     
     # Speed profile calculation complete
     
     return speeds, lap_time
 
-def optimize_racing_line(track, model: RacingLineModel = RacingLineModel.PHYSICS_BASED) -> List[Dict]:
+def _clean_array_for_json(values) -> list:
+    """Replace NaN/inf with 0.0 so the array serializes as plain JSON numbers"""
+    return np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0).tolist()
+
+@functools.lru_cache(maxsize=32)
+def _prepare_track(points_bytes: bytes, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Optimize racing lines for all cars on the track with crossover prevention
+    Resample the track centreline, align it with the original start and compute its
+    curvature and normal vectors.
+    Cached on the raw point bytes; the returned arrays are shared, so they are read-only.
     """
-    # Convert track points to numpy array
-    track_points = np.array([(p.x, p.y) for p in track.track_points])
-    track_width = track.width
-    friction = track.friction
+    track_points = np.frombuffer(points_bytes, dtype=np.float64).reshape(n, 2)
     
     # Store the original start position for alignment
     original_start = track_points[0].copy()
     
     # Resample track points to manageable size
-    resampled_points = resample_track_points(track_points, num_points=min(100, len(track_points)))
+    resampled_points = resample_track_points(track_points, num_points=min(100, n))
     
     # Ensure the resampled track starts at the same position as the original
     # Find the closest point in resampled track to the original start
-    distances = np.linalg.norm(resampled_points - original_start, axis=1)
-    start_idx = np.argmin(distances)
+    # (squared distances give the same argmin without the square roots)
+    offsets_from_start = resampled_points - original_start
+    start_idx = int(np.argmin(np.einsum('ij,ij->i', offsets_from_start, offsets_from_start)))
     
     # Rotate the resampled points so they start at the correct position
     if start_idx != 0:
-        resampled_points = np.vstack([
-            resampled_points[start_idx:],
-            resampled_points[1:start_idx+1]  # Skip the duplicate point at the end
-        ])
+        # Rotate the open loop (without the duplicate end point), then re-close it
+        rotated_points = np.empty_like(resampled_points)
+        rotated_points[:-1] = np.roll(resampled_points[:-1], -start_idx, axis=0)
+        rotated_points[-1] = rotated_points[0]
+        resampled_points = rotated_points
     
     # Calculate curvature for the track centerline
     curvature = compute_curvature(resampled_points)
     
+    # Track frame shared by the separated lines
+    _, perpendicular_vectors = track_frame(resampled_points)
+    
+    for array in (resampled_points, curvature, perpendicular_vectors):
+        array.flags.writeable = False
+    return resampled_points, curvature, perpendicular_vectors
+
+@functools.lru_cache(maxsize=32)
+def _gaussian_operator(sigma: float, n: int, mode: str) -> np.ndarray:
+    """
+    Gaussian filter as an (n, n) matrix: M @ x == gaussian_filter1d(x, sigma, mode=mode).
+    Built once per (sigma, n, mode) by filtering the identity, so the kernel and truncation match exactly.
+    """
+    operator = gaussian_filter1d(np.eye(n), sigma=sigma, axis=0, mode=mode)
+    operator.flags.writeable = False
+    return operator
+
+@functools.lru_cache(maxsize=32)
+def _separated_line_operator(n: int) -> np.ndarray:
+    """
+    The successive SEPARATED_LINE_SIGMAS passes (reflect mode) composed into one (n, n) matrix.
+    The passes are linear, so the product matches filtering pass by pass.
+    """
+    operator = np.eye(n)
+    for sigma in SEPARATED_LINE_SIGMAS:
+        operator = _gaussian_operator(sigma, n, 'reflect') @ operator
+    operator.flags.writeable = False
+    return operator
+
+def _process_car(
+    i: int,
+    car: Car,
+    racing_lines: List[np.ndarray],
+    base_racing_line: np.ndarray,
+    friction: float,
+    model_value: str,
+    resampled_points: np.ndarray
+) -> Dict:
+    """
+    Compute the speed profile and lap time for one car on its racing line
+    """
+    try:
+        # Use the appropriate racing line for this car
+        racing_line = racing_lines[i] if i < len(racing_lines) else base_racing_line
+        
+        # Ensure this racing line is also properly closed
+        racing_line = _close_loop(racing_line)
+        
+        # Calculate speed profile for this racing line
+        racing_curvature = compute_curvature(racing_line)
+        speeds, lap_time = calculate_speed_profile(racing_line, racing_curvature, friction, car)
+        
+        # Clean data for JSON serialization
+        clean_coordinates = _clean_array_for_json(racing_line)
+        clean_speeds = _clean_array_for_json(speeds)
+        clean_lap_time = float(np.nan_to_num(lap_time, nan=0.0, posinf=0.0, neginf=0.0))
+        
+        return {
+            "car_id": car.id,
+            "coordinates": clean_coordinates,
+            "speeds": clean_speeds,
+            "lap_time": clean_lap_time,
+            "model": model_value
+        }
+    except Exception as e:
+        # If optimization fails for a car, provide a safe fallback
+        log.warning("Optimization failed for car %s: %s", car.id, e)
+        return {
+            "car_id": car.id,
+            "coordinates": resampled_points.tolist(),  # Use resampled track as fallback
+            "speeds": [10.0] * len(resampled_points),  # Safe fallback speed
+            "lap_time": len(resampled_points) * 0.1,   # Fallback lap time
+            "model": model_value
+        }
+
+def optimize_racing_line(track, model: RacingLineModel = RacingLineModel.PHYSICS_BASED) -> List[Dict]:
+    """
+    Optimize racing lines for all cars on the track with crossover prevention
+    """
+    # Convert track points to numpy array, filling x and y columns directly
+    n_track_points = len(track.track_points)
+    track_points = np.empty((n_track_points, 2), dtype=np.float64)
+    track_points[:, 0] = np.fromiter((p.x for p in track.track_points), dtype=np.float64, count=n_track_points)
+    track_points[:, 1] = np.fromiter((p.y for p in track.track_points), dtype=np.float64, count=n_track_points)
+    track_width = track.width
+    friction = track.friction
+    
+    # Resampled centreline and its curvature, shared by every call on the same track
+    resampled_points, curvature, perpendicular_vectors = _prepare_track(
+        track_points.tobytes(), track_points.shape[0]
+    )
+    
     # Get the appropriate model
     racing_model = MODELS.get(model, MODELS[RacingLineModel.PHYSICS_BASED])
     
@@ -325,165 +543,129 @@ def optimize_racing_line(track, model: RacingLineModel = RacingLineModel.PHYSICS
     # Use track friction
     friction = track.friction
     
-    base_racing_line = racing_model.calculate_racing_line(
-        resampled_points, curvature, track_width, car_params, friction
+    # Racing line for this model, track and lead car, shared by repeated requests
+    base_racing_line = _base_racing_line(
+        racing_model, track_points.tobytes(), track_points.shape[0], track_width,
+        tuple(car_params.items()) if car_params is not None else None, friction
     )
     
-    # Racing line calculated
-    
-    # Ensure the racing line is also properly closed and starts at the correct position
-    if not np.allclose(base_racing_line[0], base_racing_line[-1], atol=1e-3):
-        base_racing_line = np.vstack([base_racing_line, base_racing_line[0]])
-    
     # Always use separated racing lines function for consistent smoothing
     # This ensures both single and multiple cars get the same smoothing treatment
     num_cars = len(track.cars)
     racing_lines = create_separated_racing_lines(
-        resampled_points, base_racing_line, track_width, num_cars
+        resampled_points, base_racing_line, track_width, num_cars, perpendicular_vectors
     )
     
-    optimal_lines = []
-    
-    for i, car in enumerate(track.cars):
-        try:
-            # Use the appropriate racing line for this car
-            racing_line = racing_lines[i] if i < len(racing_lines) else base_racing_line
-            
-            # Ensure this racing line is also properly closed
-            if not np.allclose(racing_line[0], racing_line[-1], atol=1e-3):
-                racing_line = np.vstack([racing_line, racing_line[0]])
-            
-            # Calculate speed profile for this racing line
-            racing_curvature = compute_curvature(racing_line)
-            speeds, lap_time = calculate_speed_profile(racing_line, racing_curvature, friction, car)
-            
-            # Clean data for JSON serialization
-            def clean_for_json(value):
-                if isinstance(value, np.ndarray):
-                    cleaned = np.where(np.isfinite(value), value, 0.0)
-                    return cleaned.tolist()
-                elif isinstance(value, (int, float)):
-                    return float(value) if np.isfinite(value) else 0.0
-                else:
-                    return value
-            
-            clean_coordinates = clean_for_json(racing_line)
-            clean_speeds = clean_for_json(speeds)
-            clean_lap_time = clean_for_json(lap_time)
-            
-            optimal_lines.append({
-                "car_id": car.id,
-                "coordinates": clean_coordinates,
-                "speeds": clean_speeds,
-                "lap_time": clean_lap_time,
-                "model": model.value
-            })
-        except Exception as e:
-            # If optimization fails for a car, provide a safe fallback
-            print(f"⚠️ Optimization failed for car {car.id}: {str(e)}")
-            optimal_lines.append({
-                "car_id": car.id,
-                "coordinates": resampled_points.tolist(),  # Use resampled track as fallback
-                "speeds": [10.0] * len(resampled_points),  # Safe fallback speed
-                "lap_time": len(resampled_points) * 0.1,   # Fallback lap time
-                "model": model.value
-            })
+    optimal_lines = [
+        _process_car(i, car, racing_lines, base_racing_line, friction, model.value, resampled_points)
+        for i, car in enumerate(track.cars)
+    ]
     
     return optimal_lines
 
+@functools.lru_cache(maxsize=32)
+def _base_racing_line(racing_model, points_bytes: bytes, n: int, track_width: float,
+                      car_items: Optional[tuple], friction: float) -> np.ndarray:
+    """
+    Run the racing line model on the prepared track and close the resulting loop.
+    Cached on the model, raw track points and car parameters so identical requests skip
+    the solve; the returned line is shared, so it is read-only.
+    """
+    resampled_points, curvature, _ = _prepare_track(points_bytes, n)
+    car_params = dict(car_items) if car_items is not None else None
+    
+    base_racing_line = racing_model.calculate_racing_line(
+        resampled_points, curvature, track_width, car_params, friction
+    )
+    
+    # Ensure the racing line is also properly closed and starts at the correct position
+    base_racing_line = _close_loop(base_racing_line)
+    base_racing_line.flags.writeable = False
+    return base_racing_line
+
+def _compute_offsets(num_cars: int, min_separation: float, max_usable_width: float) -> np.ndarray:
+    """
+    Lateral offset of each car's line from the base racing line
+    """
+    if num_cars == 1:
+        # Single car - use optimal racing line with zero offset but apply smoothing
+        return np.array([0.0])
+    if num_cars == 2:
+        return np.array([-0.7, 0.7]) * min_separation
+    if num_cars == 3:
+        return np.array([-1.0, 0.0, 1.0]) * min_separation
+    if num_cars == 4:
+        return np.array([-1.2, -0.4, 0.4, 1.2]) * min_separation
+    
+    # More than 4 cars - distribute evenly
+    num_cars = min(num_cars, MAX_SEPARATED_CARS)
+    if num_cars < 1:
+        return np.empty(0)
+    
+    total_width = min(min_separation * (num_cars - 1), max_usable_width)
+    return -total_width / 2 + np.arange(num_cars) * (total_width / (num_cars - 1))
+
 def create_separated_racing_lines(
     track_points: np.ndarray, 
     base_racing_line: np.ndarray, 
     track_width: float, 
-    num_cars: int
+    num_cars: int,
+    perpendicular_vectors: Optional[np.ndarray] = None
 ) -> List[np.ndarray]:
     """
     Create separated racing lines for cars and apply consistent smoothing
     For single car: applies smoothing with zero offset (optimal line)
     For multiple cars: creates separated lines to prevent crossovers
     """
-    racing_lines = []
-    
-    # Calculate track direction and normal vectors
-    direction_vectors = np.diff(track_points, axis=0)
-    direction_vectors = np.vstack([direction_vectors, direction_vectors[-1]])
-    
-    # Normalize direction vectors
-    norms = np.linalg.norm(direction_vectors, axis=1)
-    norms = np.where(norms == 0, 1, norms)
-    direction_vectors = direction_vectors / norms[:, np.newaxis]
-    
-    # Calculate perpendicular vectors (normal to track)
-    perpendicular_vectors = np.array([-direction_vectors[:, 1], direction_vectors[:, 0]]).T
+    # Calculate track normal vectors unless the caller already has them
+    if perpendicular_vectors is None:
+        _, perpendicular_vectors = track_frame(track_points)
     
     # Calculate safe separation distance between cars
     min_separation = min(3.0, track_width * 0.2)
     max_usable_width = track_width * 0.8
     
     # Calculate positions for each car
-    if num_cars == 1:
-        # Single car - use optimal racing line with zero offset but apply smoothing
-        offsets = [0.0]
-    elif num_cars == 2:
-        offsets = [-min_separation * 0.7, min_separation * 0.7]
-    elif num_cars == 3:
-        offsets = [-min_separation, 0, min_separation]
-    elif num_cars == 4:
-        offsets = [-min_separation * 1.2, -min_separation * 0.4, 
-                  min_separation * 0.4, min_separation * 1.2]
+    offsets = _compute_offsets(num_cars, min_separation, max_usable_width)
+    
+    # Shared per-point views and the base line's offset from the centreline,
+    # computed once and reused by every car
+    n_line_points = len(base_racing_line)
+    centre_points = track_points[:n_line_points]
+    line_perpendiculars = perpendicular_vectors[:n_line_points]
+    base_offsets = base_racing_line - centre_points
+    max_allowed_distance = track_width * 0.45
+    
+    # Apply every car's offset at once: (cars, points, 2)
+    offset_vectors = line_perpendiculars[np.newaxis, :, :] * offsets[:, np.newaxis, np.newaxis]
+    proposed_points = base_racing_line[np.newaxis, :, :] + offset_vectors
+    
+    # Check if the offset points are within track boundaries
+    centre_offsets = base_offsets[np.newaxis, :, :] + offset_vectors
+    distance_from_center = np.hypot(centre_offsets[..., 0], centre_offsets[..., 1])
+    within_bounds = distance_from_center <= max_allowed_distance
+    
+    # Scale down offset to stay within boundaries where needed
+    if within_bounds.all():
+        # Nothing to rescale, so skip building the scaled-down candidates
+        separated_lines = proposed_points
     else:
-        # More than 4 cars - distribute evenly
-        if num_cars > 6:
-            num_cars = 6
-        
-        total_width = min_separation * (num_cars - 1)
-        if total_width > max_usable_width:
-            scale_factor = max_usable_width / total_width
-            total_width = max_usable_width
-            min_separation *= scale_factor
-        
-        offsets = []
-        for i in range(num_cars):
-            offset = -total_width/2 + i * (total_width / (num_cars - 1))
-            offsets.append(offset)
-    
-    # Create racing line for each car
-    for i, offset in enumerate(offsets):
-        car_racing_line = base_racing_line.copy()
-        
-        # Apply offset to create separated line
-        for j in range(len(car_racing_line)):
-            # Calculate offset vector
-            offset_vector = perpendicular_vectors[j] * offset
-            
-            # Apply offset
-            proposed_point = car_racing_line[j] + offset_vector
-            
-            # Check if the offset point is within track boundaries
-            distance_from_center = np.linalg.norm(proposed_point - track_points[j])
-            max_allowed_distance = track_width * 0.45
-            
-            if distance_from_center <= max_allowed_distance:
-                car_racing_line[j] = proposed_point
-            else:
-                # Scale down offset to stay within boundaries
-                scale_factor = max_allowed_distance / distance_from_center
-                car_racing_line[j] = track_points[j] + offset_vector * scale_factor
-        
-        # Apply smoothing to the separated line
-        try:
-            # Multiple passes of smoothing for very clean lines
-            for sigma in [1.0, 1.5, 2.0]:
-                car_racing_line[:, 0] = gaussian_filter1d(car_racing_line[:, 0], sigma=sigma)
-                car_racing_line[:, 1] = gaussian_filter1d(car_racing_line[:, 1], sigma=sigma)
-        except:
-            pass
-        
-        # Ensure the racing line is properly closed
-        if not np.allclose(car_racing_line[0], car_racing_line[-1], atol=1e-3):
-            car_racing_line = np.vstack([car_racing_line, car_racing_line[0]])
-        
-        racing_lines.append(car_racing_line)
+        scale_factors = max_allowed_distance / np.maximum(distance_from_center, 1e-9)
+        separated_lines = np.where(
+            within_bounds[:, :, np.newaxis],
+            proposed_points,
+            centre_points[np.newaxis, :, :] + offset_vectors * scale_factors[:, :, np.newaxis]
+        )
+    
+    # Smooth all cars' lines together along the point axis: the 1.0/1.5/2.0 passes are
+    # applied as one cached filter matrix
+    smoothed_lines = _separated_line_operator(n_line_points) @ separated_lines
+    
+    # Close every line by repeating its first point, so all cars get the same number of points
+    closed_lines = np.empty((len(offsets), n_line_points + 1, 2))
+    closed_lines[:, :-1] = smoothed_lines
+    closed_lines[:, -1] = smoothed_lines[:, 0]
+    racing_lines = list(closed_lines)
     
     return racing_lines
 
@@ -497,4 +679,20 @@ def get_available_models() -> List[Dict]:
         model_info["id"] = model_key.value
         models.append(model_info)
     
-    return models 
\ No newline at end of file
+    return models
+
+def warm_up() -> None:
+    """
+    Run every model once on a small synthetic track so the numba kernels are compiled
+    (or loaded from the on-disk cache) before the first real request
+    """
+    angles = np.linspace(0.0, 2.0 * np.pi, 40, endpoint=False)
+    track = Track(
+        track_points=[TrackPoint(x=500.0 + 300.0 * math.cos(a), y=500.0 + 200.0 * math.sin(a)) for a in angles],
+        width=12.0,
+        friction=1.0,
+        cars=[Car(id="warm-up", mass=798.0, length=5.6, width=2.0,
+                  max_steering_angle=20.0, max_acceleration=10.0)]
+    )
+    for model in RacingLineModel:
+        optimize_racing_line(track, model)
@@ -0,0 +1,94 @@
+"""
+Regression tests for the racing line optimizer's track resampling
+"""
+import os
+import sys
+
+import numpy as np
+from scipy.interpolate import splprep, splev
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.optimizer import _fit_periodic_spline, resample_track_points
+
+
+def _ellipse(n_points):
+    """Ellipse whose end point repeats the start only to within rounding"""
+    theta = np.linspace(0, 2 * np.pi, n_points)
+    return np.column_stack((300 * np.cos(theta), 200 * np.sin(theta)))
+
+
+def test_nearly_closed_track_uses_periodic_fit():
+    points = _ellipse(60)
+    assert 0 < np.abs(points[-1] - points[0]).max() < 1e-3
+
+    # No repeated final knot, so the periodic spline fits without falling back
+    _fit_periodic_spline(points.tobytes(), points.shape[0])
+
+    # Same shape as the periodic splprep fit
+    tck, _ = splprep([points[:, 0], points[:, 1]], s=0, per=True)
+    x_ref, y_ref = splev(np.linspace(0, 1, 51)[:-1], tck)
+    expected = np.column_stack((x_ref, y_ref))
+    expected = np.vstack([expected, expected[0]])
+
+    np.testing.assert_allclose(resample_track_points(points, 50), expected, atol=1e-9)
+
+
+def _thunderhill(num_cars):
+    from data.track_data import get_sample_f1_tracks
+    from schemas.track import Car, Track, TrackPoint
+
+    track = next(t for t in get_sample_f1_tracks() if t["name"] == "Thunderhill Raceway Park")
+    cars = [Car(id=f"c{i}", mass=700 + 100 * i, length=5, width=2,
+                max_steering_angle=20, max_acceleration=8 + i) for i in range(num_cars)]
+    return Track(track_points=[TrackPoint(**p) for p in track["track_points"]],
+                 width=track["width"], friction=track["friction"], cars=cars)
+
+
+def test_separated_lines_match_per_car_smoothing():
+    from scipy.ndimage import gaussian_filter1d
+    from simulation.optimizer import _compute_offsets, create_separated_racing_lines, track_frame
+
+    track_points = resample_track_points(_ellipse(60), 40)
+    base_line = track_points * 0.98
+    track_width = 12.0
+    _, normals = track_frame(track_points)
+
+    for num_cars in range(1, 7):
+        lines = create_separated_racing_lines(track_points, base_line, track_width, num_cars)
+        offsets = _compute_offsets(num_cars, min(3.0, track_width * 0.2), track_width * 0.8)
+        assert len(lines) == len(offsets)
+
+        for line, offset in zip(lines, offsets):
+            # Reference: offset within the boundaries, 1.0/1.5/2.0 passes, then close
+            expected = base_line + normals * offset
+            distance = np.hypot(*(expected - track_points).T)
+            outside = distance > track_width * 0.45
+            scale = track_width * 0.45 / distance[outside]
+            expected[outside] = track_points[outside] + normals[outside] * offset * scale[:, np.newaxis]
+            for sigma in (1.0, 1.5, 2.0):
+                expected = gaussian_filter1d(expected, sigma=sigma, axis=0)
+            expected = np.vstack([expected, expected[0]])
+
+            np.testing.assert_allclose(line, expected, atol=1e-9)
+
+
+def test_every_car_gets_a_closed_line_of_the_same_length():
+    from simulation.optimizer import RacingLineModel, optimize_racing_line
+
+    for model in RacingLineModel:
+        for num_cars in range(1, 7):
+            results = optimize_racing_line(_thunderhill(num_cars), model)
+            lengths = {len(r["coordinates"]) for r in results} | {len(r["speeds"]) for r in results}
+            assert len(lengths) == 1
+            for result in results:
+                assert result["coordinates"][-1] == result["coordinates"][0]
+
+
+def test_separated_lap_times_unchanged():
+    from simulation.optimizer import RacingLineModel, optimize_racing_line
+
+    # Lap times of the original per-car implementation, heaviest car slowest
+    results = optimize_racing_line(_thunderhill(5), RacingLineModel.BASIC)
+    lap_times = [r["lap_time"] for r in results]
+    np.testing.assert_allclose(lap_times, [17.15, 17.27, 17.43, 17.59, 17.75], atol=0.01)
@@ -14,27 +14,21 @@ import argparse
 
 
 def distances(points):
+    points = np.asarray(points, dtype=float)
     d = np.zeros(len(points))
-    for i in range(len(points) - 1):
-        dx = points[i+1][0] - points[i][0]
-        dy = points[i+1][1] - points[i][1]
-        d[i] = np.sqrt(dx**2 + dy**2)
+    seg = np.diff(points, axis=0)
+    d[:-1] = np.hypot(seg[:, 0], seg[:, 1])
     if len(points) > 2:
-        dx = points[0][0] - points[-1][0]
-        dy = points[0][1] - points[-1][1]
-        d[-1] = np.sqrt(dx**2 + dy**2)
+        closing = points[0] - points[-1]
+        d[-1] = np.hypot(closing[0], closing[1])
     return d
 
 
 def lap_time(speeds, racing_line):
     d = distances(racing_line)
-    t = 0.0
-    for i in range(len(d)):
-        if speeds[i] > 1e-6 and d[i] > 1e-6:
-            t += d[i] / speeds[i]
-        else:
-            t += d[i] / 10.0
-    return t
+    speeds = np.asarray(speeds, dtype=float)[:len(d)]
+    valid = (speeds > 1e-6) & (d > 1e-6)
+    return float(np.sum(d / np.where(valid, speeds, 10.0)))
 
 
 def smooth_path_high_speed(racing_line, speeds):
@@ -9,6 +9,9 @@ This shows the complete iterative optimization process combining:
 4. Lap time optimization
 """
 
+import argparse
+import cProfile
+import pstats
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -136,27 +139,21 @@ def apply_offsets_to_racing_line(track_points, offsets):
 
 def calculate_lap_time(speeds, racing_line):
     """Calculate total lap time"""
+    racing_line = np.asarray(racing_line, dtype=float)
     distances = np.zeros(len(racing_line))
     
-    for i in range(len(racing_line) - 1):
-        dx = racing_line[i+1][0] - racing_line[i][0]
-        dy = racing_line[i+1][1] - racing_line[i][1]
-        distances[i] = np.sqrt(dx**2 + dy**2)
+    segments = np.diff(racing_line, axis=0)
+    distances[:-1] = np.hypot(segments[:, 0], segments[:, 1])
     
     # Close the loop
     if len(racing_line) > 2:
-        dx = racing_line[0][0] - racing_line[-1][0]
-        dy = racing_line[0][1] - racing_line[-1][1]
-        distances[-1] = np.sqrt(dx**2 + dy**2)
-    
-    lap_time = 0.0
-    for i in range(len(distances)):
-        if speeds[i] > 1e-6 and distances[i] > 1e-6:
-            lap_time += distances[i] / speeds[i]
-        else:
-            lap_time += distances[i] / 10.0
+        closing = racing_line[0] - racing_line[-1]
+        distances[-1] = np.hypot(closing[0], closing[1])
     
-    return lap_time
+    # Fall back to 10 m/s for invalid speeds or distances
+    speeds = np.asarray(speeds, dtype=float)[:len(distances)]
+    valid = (speeds > 1e-6) & (distances > 1e-6)
+    return float(np.sum(distances / np.where(valid, speeds, 10.0)))
 
 def optimize_path_geometry(racing_line, speeds):
     """Optimize path geometry for high-speed sections"""
@@ -283,7 +280,7 @@ def complete_physics_optimization(track_points, track_curvature, track_width, ca
     
     return best_path, best_lap_time, optimization_history
 
-def demonstrate_complete_physics_integration():
+def demonstrate_complete_physics_integration(out_path=None):
     """Demonstrate the complete physics model with all components"""
     
     # Car parameters (from physics_model.py defaults)
@@ -465,9 +462,31 @@ COMPLETE PHYSICS MODEL INTEGRATION SUMMARY
     plt.suptitle('Complete Physics Model Integration - All Components Working Together', 
                 fontsize=18, weight='bold')
     
-    plt.show()
+    if out_path:
+        plt.savefig(out_path, dpi=150, bbox_inches='tight')
+    else:
+        plt.show()
     
     return best_path, best_lap_time, history
 
 if __name__ == "__main__":
-    demonstrate_complete_physics_integration()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the optimization with cProfile instead of showing the figure')
+    parser.add_argument('--out', type=str, default=None, help='Path to save the figure (PNG)')
+    args = parser.parse_args()
+    
+    if args.out:
+        # Saving only - skip interactive backend start-up
+        plt.switch_backend('Agg')
+    
+    if args.profile:
+        # Non-interactive backend so plt.show() does not block the profile
+        plt.switch_backend('Agg')
+        profiler = cProfile.Profile()
+        profiler.enable()
+        demonstrate_complete_physics_integration()
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(30)
+    else:
+        demonstrate_complete_physics_integration(args.out)